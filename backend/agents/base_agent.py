@@ -3,6 +3,7 @@ Base agent class for MemoryChat Multi-Agent application.
 All agents inherit from this abstract base class.
 """
 import time
+import threading
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, List
 from datetime import datetime
@@ -26,7 +27,13 @@ except ImportError:
     ChatOpenAI = None
     BaseMessage = None
 
-from config.settings import settings
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+from config.settings import settings, openai_api_key_configured
 from config.logging_config import (
     get_agent_logger,
     log_agent_start,
@@ -59,6 +66,30 @@ class BaseAgent(ABC):
     - Standard input/output format
     """
     
+    # HTTP client shared by every agent's LLM so connections are reused
+    _shared_http_client: Optional["httpx.Client"] = None
+    _shared_http_client_lock = threading.Lock()
+    
+    @classmethod
+    def get_http_client(cls) -> Optional["httpx.Client"]:
+        """
+        Get the HTTP client shared by all agents, creating it on first use.
+        
+        Returns:
+            Shared httpx client, or None if httpx is not available
+        """
+        if not HTTPX_AVAILABLE:
+            return None
+        
+        if BaseAgent._shared_http_client is None:
+            with BaseAgent._shared_http_client_lock:
+                if BaseAgent._shared_http_client is None:
+                    BaseAgent._shared_http_client = httpx.Client(
+                        limits=httpx.Limits(max_keepalive_connections=32),
+                        timeout=httpx.Timeout(60.0, connect=5.0),
+                    )
+        return BaseAgent._shared_http_client
+    
     def __init__(
         self,
         name: str,
@@ -94,8 +125,7 @@ class BaseAgent(ABC):
         self.llm = None
         if llm_model and LANGCHAIN_AVAILABLE:
             try:
-                api_key = getattr(settings, 'OPENAI_API_KEY', None)
-                if not api_key or api_key == "your-api-key-here":
+                if not openai_api_key_configured():
                     self.logger.warning(
                         f"OPENAI_API_KEY not configured. Agent '{self.name}' will not be able to use LLM."
                     )
@@ -104,11 +134,17 @@ class BaseAgent(ABC):
                     init_params = {
                         "model_name": llm_model,
                         "temperature": temperature,
-                        "openai_api_key": api_key,
+                        "openai_api_key": settings.OPENAI_API_KEY,
                     }
                     if max_tokens:
                         init_params["max_tokens"] = max_tokens
                     
+                    # Reuse one connection pool across agents instead of
+                    # a new client (and TLS handshake) per agent
+                    http_client = self.get_http_client()
+                    if http_client is not None:
+                        init_params["http_client"] = http_client
+                    
                     self.llm = ChatOpenAI(**init_params)
                     self.logger.info(
                         f"Initialized LLM for agent '{self.name}': {llm_model} "
@@ -252,10 +288,11 @@ class BaseAgent(ABC):
             # Use temperature override if provided, otherwise use agent's default
             temp = temperature if temperature is not None else self.temperature
             
-            # Temporarily override temperature if needed
-            original_temp = getattr(self.llm, 'temperature', temp)
-            if temp != original_temp and hasattr(self.llm, 'temperature'):
-                self.llm.temperature = temp
+            # Bind a temperature override to this call only. The LLM client is
+            # shared by concurrent requests, so it is never modified in place.
+            llm = self.llm
+            if temp != getattr(self.llm, 'temperature', temp):
+                llm = self.llm.bind(temperature=temp)
             
             # Call LLM with token tracking
             tokens_used = 0
@@ -265,7 +302,7 @@ class BaseAgent(ABC):
             
             try:
                 with get_openai_callback() as cb:
-                    response = self.llm(messages)
+                    response = llm.invoke(messages)
                     tokens_used = getattr(cb, 'total_tokens', 0)
                     input_tokens = getattr(cb, 'prompt_tokens', 0)
                     output_tokens = getattr(cb, 'completion_tokens', 0)
@@ -287,11 +324,7 @@ class BaseAgent(ABC):
             except Exception as callback_error:
                 # If callback fails, still try to get response
                 self.logger.warning(f"Token tracking failed: {callback_error}")
-                response = self.llm(messages)
-            
-            # Restore original temperature
-            if temp != original_temp and hasattr(self.llm, 'temperature'):
-                self.llm.temperature = original_temp
+                response = llm.invoke(messages)
             
             return self._parse_response(response)
             
@@ -3,6 +3,8 @@ Context Coordinator Agent for MemoryChat Multi-Agent application.
 Orchestrates all other agents and manages the conversation flow.
 """
 import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 
@@ -29,6 +31,10 @@ from config.agent_config import (
 from config.logging_config import get_agent_logger
 
 
+# Shared, immutable default for history and memory entries missing from context
+_NO_ITEMS = ()
+
+
 class ContextCoordinatorAgent(BaseAgent):
     """
     Orchestrator agent that coordinates all other agents.
@@ -70,10 +76,30 @@ class ContextCoordinatorAgent(BaseAgent):
         # Analysis interval (analyze every N messages)
         self.analysis_interval = 5
         
-        # Execution tracking
+        # Execution tracking, kept per thread so concurrent requests sharing
+        # this coordinator don't mix up their agent lists and token counts
+        self._tracking = threading.local()
         self.agents_executed = []
         self.tokens_used_by_agent = {}
     
+    @property
+    def agents_executed(self) -> List[str]:
+        """Agents executed by the current run on this thread."""
+        return self._tracking.__dict__.setdefault("agents_executed", [])
+    
+    @agents_executed.setter
+    def agents_executed(self, value: List[str]) -> None:
+        self._tracking.agents_executed = value
+    
+    @property
+    def tokens_used_by_agent(self) -> Dict[str, int]:
+        """Tokens used per agent by the current run on this thread."""
+        return self._tracking.__dict__.setdefault("tokens_used_by_agent", {})
+    
+    @tokens_used_by_agent.setter
+    def tokens_used_by_agent(self, value: Dict[str, int]) -> None:
+        self._tracking.tokens_used_by_agent = value
+    
     def execute(self, input_data: AgentInput, context: Optional[Dict[str, Any]] = None) -> AgentOutput:
         """
         Execute orchestration flow.
@@ -116,8 +142,8 @@ class ContextCoordinatorAgent(BaseAgent):
                 "privacy_mode": privacy_mode,
                 "profile_id": profile_id,
                 "user_message": user_message,
-                "conversation_history": input_data.get("context", {}).get("conversation_history", []),
-                "existing_memories": input_data.get("context", {}).get("existing_memories", []),
+                "conversation_history": input_data.get("context", {}).get("conversation_history", _NO_ITEMS),
+                "existing_memories": input_data.get("context", {}).get("existing_memories", _NO_ITEMS),
             }
             
             # STEP 1: Privacy Check
@@ -149,10 +175,30 @@ class ContextCoordinatorAgent(BaseAgent):
                 orchestration_context["user_message"] = sanitized_content
                 orchestration_context["sanitized"] = True
             
+            # Periodic analysis only needs the conversation history, so start
+            # it now and let it run alongside memory retrieval and conversation
+            # generation. The executor belongs to this call, so concurrent
+            # requests sharing the coordinator don't queue behind each other.
+            pending_analysis = None
+            conversation_history = orchestration_context.get("conversation_history", _NO_ITEMS)
+            if len(conversation_history) > 0 and len(conversation_history) % self.analysis_interval == 0:
+                analysis_executor = ThreadPoolExecutor(
+                    max_workers=1,
+                    thread_name_prefix="coordinator-analysis"
+                )
+                pending_analysis = analysis_executor.submit(
+                    self.conversation_analyst._execute_with_wrapper,
+                    self._build_analysis_input(input_data, orchestration_context)
+                )
+                # Already-submitted work still runs; the worker exits when done
+                analysis_executor.shutdown(wait=False)
+            
             # STEP 2: Memory Retrieval (if not INCOGNITO)
             memory_context = ""
             if privacy_mode != "incognito":
-                retrieval_result = self._execute_memory_retrieval(input_data, orchestration_context)
+                retrieval_result = self._execute_memory_retrieval(
+                    input_data, orchestration_context
+                )
                 if retrieval_result.get("success"):
                     memory_context = retrieval_result.get("data", {}).get("context", "")
                     orchestration_context["memory_context"] = memory_context
@@ -191,7 +237,7 @@ class ContextCoordinatorAgent(BaseAgent):
                     "profile_id": profile_id,
                     "context": {
                         "assistant_response": response,
-                        "conversation_history": orchestration_context.get("conversation_history", []),
+                        "conversation_history": orchestration_context.get("conversation_history", _NO_ITEMS),
                     }
                 }
                 memory_extraction_result = self._execute_memory_management(
@@ -200,11 +246,12 @@ class ContextCoordinatorAgent(BaseAgent):
                 if not memory_extraction_result.get("success"):
                     self.logger.warning("Memory extraction failed, continuing without storing memories")
             
-            # STEP 5: Analysis (periodic)
+            # STEP 5: Analysis (periodic, started after the privacy check)
             analysis_result = None
-            conversation_history = orchestration_context.get("conversation_history", [])
-            if len(conversation_history) > 0 and len(conversation_history) % self.analysis_interval == 0:
-                analysis_result = self._execute_analysis(input_data, orchestration_context)
+            if pending_analysis is not None:
+                analysis_result = self._execute_analysis(
+                    input_data, orchestration_context, pending=pending_analysis
+                )
                 if not analysis_result.get("success"):
                     self.logger.debug("Analysis failed, continuing without analysis")
             
@@ -291,11 +338,12 @@ class ContextCoordinatorAgent(BaseAgent):
         """Execute conversation generation step."""
         try:
             self.logger.debug("Executing conversation generation...")
-            # Add memory context to input
+            # Add memory context to input (copy context so the caller's dict
+            # isn't modified while other agents may be reading it)
             enhanced_input = input_data.copy()
-            enhanced_input["context"] = enhanced_input.get("context", {})
+            enhanced_input["context"] = dict(enhanced_input.get("context", {}))
             enhanced_input["context"]["memory_context"] = context.get("memory_context", "")
-            enhanced_input["context"]["conversation_history"] = context.get("conversation_history", [])
+            enhanced_input["context"]["conversation_history"] = context.get("conversation_history", _NO_ITEMS)
             
             result = self.conversation_agent._execute_with_wrapper(enhanced_input)
             self._track_agent_execution("ConversationAgent", result)
@@ -327,21 +375,33 @@ class ContextCoordinatorAgent(BaseAgent):
                 "data": {"memories": []},
             }
     
-    def _execute_analysis(
+    def _build_analysis_input(
         self,
         input_data: AgentInput,
         context: Dict[str, Any]
+    ) -> AgentInput:
+        """Build conversation analyst input with history and existing memories."""
+        enhanced_input = input_data.copy()
+        enhanced_input["context"] = dict(enhanced_input.get("context", {}))
+        enhanced_input["context"]["conversation_history"] = context.get("conversation_history", _NO_ITEMS)
+        enhanced_input["context"]["existing_memories"] = context.get("existing_memories", _NO_ITEMS)
+        return enhanced_input
+    
+    def _execute_analysis(
+        self,
+        input_data: AgentInput,
+        context: Dict[str, Any],
+        pending: Optional[Future] = None
     ) -> Dict[str, Any]:
-        """Execute conversation analysis step."""
+        """Execute conversation analysis step, or wait for one already started."""
         try:
             self.logger.debug("Executing conversation analysis...")
-            # Add conversation history to input
-            enhanced_input = input_data.copy()
-            enhanced_input["context"] = enhanced_input.get("context", {})
-            enhanced_input["context"]["conversation_history"] = context.get("conversation_history", [])
-            enhanced_input["context"]["existing_memories"] = context.get("existing_memories", [])
-            
-            result = self.conversation_analyst._execute_with_wrapper(enhanced_input)
+            if pending is not None:
+                result = pending.result()
+            else:
+                result = self.conversation_analyst._execute_with_wrapper(
+                    self._build_analysis_input(input_data, context)
+                )
             self._track_agent_execution("ConversationAnalystAgent", result)
             return result
         except Exception as e:
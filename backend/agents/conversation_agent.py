@@ -470,16 +470,9 @@ class ConversationAgent(BaseAgent):
             if hasattr(last_message, 'content'):
                 last_message.content += f"\n\n{retry_instruction}"
         
-        # Retry with slightly lower temperature for more focused response
-        original_temp = self.temperature
-        self.temperature = max(0.3, original_temp - 0.2)
-        
-        try:
-            response = self._call_llm(messages)
-        finally:
-            self.temperature = original_temp
-        
-        return response
+        # Retry with slightly lower temperature for more focused response,
+        # passed to this call rather than set on the shared agent
+        return self._call_llm(messages, temperature=max(0.3, self.temperature - 0.2))
     
     def _handle_edge_cases(
         self,
@@ -2,9 +2,12 @@
 Privacy Guardian Agent for MemoryChat Multi-Agent application.
 Detects sensitive information and enforces privacy settings.
 """
+import hashlib
 import json
 import re
-from typing import Dict, Any, Optional, List
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 
 import sys
@@ -20,6 +23,60 @@ from config.agent_config import PRIVACY_GUARDIAN_AGENT
 from config.logging_config import get_agent_logger
 
 
+# Fixed-format PII patterns, compiled once. Each type is scanned on its own so
+# matches of different types may overlap (e.g. a phone number running into a
+# card number) without one hiding the other.
+_PII_PATTERNS = (
+    ("email", re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')),
+    ("phone", re.compile(r'(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')),
+    ("credit_card", re.compile(r'\b\d{4}[-.\s]?\d{4}[-.\s]?\d{4}[-.\s]?\d{4}\b')),
+    ("ssn", re.compile(r'\b\d{3}-\d{2}-\d{4}\b')),
+)
+
+_PII_SEVERITY = {
+    "email": "low",
+    "phone": "low",
+    "credit_card": "high",
+    "ssn": "high",
+}
+
+# Rank used to pick the placeholder when overlapping violations are redacted
+_SEVERITY_RANK = {"high": 2, "medium": 1, "low": 0}
+
+# Cheap check for the characters every pattern above (and the address and
+# date-of-birth patterns below) requires
+_PII_PREFILTER_RE = re.compile(r'[@\d]')
+
+# Placeholder substituted for each violation type when redacting
+_REDACT_MAP = {
+    "email": "[EMAIL REDACTED]",
+    "phone": "[PHONE REDACTED]",
+    "credit_card": "[CARD REDACTED]",
+    "ssn": "[SSN REDACTED]",
+    "address": "[ADDRESS REDACTED]",
+    "date_of_birth": "[DOB REDACTED]",
+    "personal_name": "[NAME REDACTED]",
+    "financial_info": "[FINANCIAL INFO REDACTED]",
+    "health_info": "[HEALTH INFO REDACTED]",
+}
+
+# Maximum number of messages whose detection results are kept
+_DETECTION_CACHE_SIZE = 1024
+
+# Context-dependent patterns
+_ADDRESS_RE = re.compile(
+    r'\b\d+\s+[A-Za-z\s]+(?:Street|St|Avenue|Ave|Road|Rd|Drive|Dr|Lane|Ln|Boulevard|Blvd|Court|Ct|Place|Pl)\b[,\s]+[A-Za-z\s]+(?:,\s*)?[A-Z]{2}\s+\d{5}',
+    re.IGNORECASE
+)
+_DATE_OF_BIRTH_RE = re.compile(
+    r'\b(?:born|birth|dob|date of birth|birthday)[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\b',
+    re.IGNORECASE
+)
+_PERSONAL_NAME_RE = re.compile(r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b')
+# Common words ("the", "this", "that", "there", "then") that rule out a name match
+_NAME_STOPWORD_RE = re.compile(r'th(?:e|is|at)', re.IGNORECASE)
+
+
 class PrivacyGuardianAgent(BaseAgent):
     """
     Agent that detects sensitive information and enforces privacy settings.
@@ -32,6 +89,10 @@ class PrivacyGuardianAgent(BaseAgent):
     - Verify profile isolation
     """
     
+    # Detection results shared by all instances, keyed by message hash
+    _detection_cache: "OrderedDict[bytes, Tuple[Tuple[Tuple[str, Any], ...], ...]]" = OrderedDict()
+    _detection_cache_lock = threading.Lock()
+    
     def __init__(self):
         """Initialize Privacy Guardian Agent with configuration."""
         config = PRIVACY_GUARDIAN_AGENT
@@ -44,13 +105,6 @@ class PrivacyGuardianAgent(BaseAgent):
             system_prompt=config["system_prompt"]
         )
         
-        # PII detection patterns
-        self.email_pattern = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
-        self.phone_pattern = re.compile(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
-        self.credit_card_pattern = re.compile(r'\b\d{4}[-.\s]?\d{4}[-.\s]?\d{4}[-.\s]?\d{4}\b')
-        self.ssn_pattern = re.compile(r'\b\d{3}-\d{2}-\d{4}\b')
-        self.date_pattern = re.compile(r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b')
-        
         # Financial keywords
         self.financial_keywords = [
             "credit card", "debit card", "bank account", "routing number",
@@ -114,6 +168,53 @@ Return JSON with:
                 - context: dict
             context: Optional additional context
             
+        Returns:
+            Standard output format with privacy check results
+        """
+        return self._check_privacy(input_data)
+    
+    def batch_execute(self, inputs: List[AgentInput]) -> List[AgentOutput]:
+        """
+        Execute privacy check and enforcement for several inputs.
+        
+        Each distinct message is scanned once per batch, however many inputs
+        share it; enforcement still runs per input since it depends on the
+        privacy mode and profile.
+        
+        Args:
+            inputs: List of inputs in the standard format (see execute)
+            
+        Returns:
+            List of outputs in the standard format, in input order
+        """
+        scanned: Dict[str, List[Dict[str, Any]]] = {}
+        outputs = []
+        
+        for input_data in inputs:
+            user_message = input_data.get("user_message", "")
+            known = scanned.get(user_message)
+            output = self._check_privacy(
+                input_data,
+                violations=[dict(v) for v in known] if known is not None else None
+            )
+            if user_message and output.get("success"):
+                scanned.setdefault(user_message, output["data"]["violations"])
+            outputs.append(output)
+        
+        return outputs
+    
+    def _check_privacy(
+        self,
+        input_data: AgentInput,
+        violations: Optional[List[Dict[str, Any]]] = None
+    ) -> AgentOutput:
+        """
+        Run the privacy check for a single input.
+        
+        Args:
+            input_data: Standard input format (see execute)
+            violations: Violations already detected for this message, if any
+            
         Returns:
             Standard output format with privacy check results
         """
@@ -140,7 +241,8 @@ Return JSON with:
                 }
             
             # Detect PII violations
-            violations = self._detect_all_pii(user_message)
+            if violations is None:
+                violations = self._detect_all_pii(user_message)
             
             # Verify profile isolation
             session_profile_id = input_data.get("context", {}).get("session_profile_id")
@@ -209,37 +311,58 @@ Return JSON with:
         """
         Detect all types of PII in text.
         
+        Detection depends only on the text, so results are cached by a hash
+        of the message and repeated messages skip the scan.
+        
         Args:
             text: Text to scan
             
         Returns:
             List of violation dictionaries
         """
-        violations = []
-        
-        # Detect email addresses
-        emails = self._detect_email_addresses(text)
-        violations.extend(emails)
-        
-        # Detect phone numbers
-        phones = self._detect_phone_numbers(text)
-        violations.extend(phones)
-        
-        # Detect credit cards
-        credit_cards = self._detect_credit_cards(text)
-        violations.extend(credit_cards)
-        
-        # Detect SSN
-        ssns = self._detect_ssn(text)
-        violations.extend(ssns)
+        key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        cache = PrivacyGuardianAgent._detection_cache
+        
+        with PrivacyGuardianAgent._detection_cache_lock:
+            cached = cache.get(key)
+            if cached is not None:
+                cache.move_to_end(key)
+        
+        if cached is None:
+            cached = tuple(tuple(v.items()) for v in self._scan_all_pii(text))
+            with PrivacyGuardianAgent._detection_cache_lock:
+                cache[key] = cached
+                if len(cache) > _DETECTION_CACHE_SIZE:
+                    cache.popitem(last=False)
+        
+        # Hand out fresh dicts so callers can't modify cached results
+        return [dict(items) for items in cached]
+    
+    def _scan_all_pii(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Run every PII detector over text.
         
-        # Detect addresses
-        addresses = self._detect_addresses(text)
-        violations.extend(addresses)
+        Args:
+            text: Text to scan
+            
+        Returns:
+            List of violation dictionaries
+        """
+        violations = []
         
-        # Detect dates of birth
-        dates = self._detect_dates_of_birth(text)
-        violations.extend(dates)
+        # Every pattern below needs an "@" or a digit; most chat messages
+        # contain neither, so skip those scans entirely when absent
+        if _PII_PREFILTER_RE.search(text):
+            # Detect emails, phone numbers, credit cards and SSNs
+            violations.extend(self._detect_pattern_pii(text))
+            
+            # Detect addresses
+            addresses = self._detect_addresses(text)
+            violations.extend(addresses)
+            
+            # Detect dates of birth
+            dates = self._detect_dates_of_birth(text)
+            violations.extend(dates)
         
         # Detect personal names (simple pattern-based)
         names = self._detect_personal_names(text)
@@ -255,115 +378,61 @@ Return JSON with:
         
         return violations
     
-    def _detect_email_addresses(self, text: str) -> List[Dict[str, Any]]:
-        """Detect email addresses in text."""
-        violations = []
-        matches = self.email_pattern.finditer(text)
-        for match in matches:
-            violations.append({
-                "type": "email",
-                "severity": "low",
-                "content": match.group(0),
-                "position": match.start(),
-            })
-        return violations
-    
-    def _detect_phone_numbers(self, text: str) -> List[Dict[str, Any]]:
-        """Detect phone numbers in text."""
-        violations = []
-        matches = self.phone_pattern.finditer(text)
-        for match in matches:
-            violations.append({
-                "type": "phone",
-                "severity": "low",
-                "content": match.group(0),
-                "position": match.start(),
-            })
-        return violations
-    
-    def _detect_credit_cards(self, text: str) -> List[Dict[str, Any]]:
-        """Detect credit card numbers in text."""
-        violations = []
-        matches = self.credit_card_pattern.finditer(text)
-        for match in matches:
-            # Basic Luhn check (simplified)
-            card_number = re.sub(r'[-.\s]', '', match.group(0))
-            if len(card_number) == 16:
-                violations.append({
-                    "type": "credit_card",
-                    "severity": "high",
-                    "content": match.group(0),
-                    "position": match.start(),
-                })
-        return violations
-    
-    def _detect_ssn(self, text: str) -> List[Dict[str, Any]]:
-        """Detect Social Security Numbers in text."""
-        violations = []
-        matches = self.ssn_pattern.finditer(text)
-        for match in matches:
-            violations.append({
-                "type": "ssn",
-                "severity": "high",
+    def _detect_pattern_pii(self, text: str) -> List[Dict[str, Any]]:
+        """Detect fixed-format PII (emails, phones, credit cards, SSNs) in text."""
+        # One finditer per type, reported grouped by type
+        return [
+            {
+                "type": pii_type,
+                "severity": _PII_SEVERITY[pii_type],
                 "content": match.group(0),
                 "position": match.start(),
-            })
-        return violations
+            }
+            for pii_type, pattern in _PII_PATTERNS
+            for match in pattern.finditer(text)
+        ]
     
     def _detect_addresses(self, text: str) -> List[Dict[str, Any]]:
         """Detect physical addresses in text."""
-        violations = []
         # Simple pattern: number + street name + city/state/zip
-        address_pattern = re.compile(
-            r'\b\d+\s+[A-Za-z\s]+(?:Street|St|Avenue|Ave|Road|Rd|Drive|Dr|Lane|Ln|Boulevard|Blvd|Court|Ct|Place|Pl)\b[,\s]+[A-Za-z\s]+(?:,\s*)?[A-Z]{2}\s+\d{5}',
-            re.IGNORECASE
-        )
-        matches = address_pattern.finditer(text)
-        for match in matches:
-            violations.append({
+        return [
+            {
                 "type": "address",
                 "severity": "medium",
                 "content": match.group(0),
                 "position": match.start(),
-            })
-        return violations
+            }
+            for match in _ADDRESS_RE.finditer(text)
+        ]
     
     def _detect_dates_of_birth(self, text: str) -> List[Dict[str, Any]]:
         """Detect dates of birth in text."""
-        violations = []
         # Look for date patterns with context words
-        date_context_pattern = re.compile(
-            r'\b(?:born|birth|dob|date of birth|birthday)[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\b',
-            re.IGNORECASE
-        )
-        matches = date_context_pattern.finditer(text)
-        for match in matches:
-            violations.append({
+        return [
+            {
                 "type": "date_of_birth",
                 "severity": "medium",
                 "content": match.group(1),
                 "position": match.start(),
-            })
-        return violations
+            }
+            for match in _DATE_OF_BIRTH_RE.finditer(text)
+        ]
     
     def _detect_personal_names(self, text: str) -> List[Dict[str, Any]]:
         """Detect personal names in text (simple pattern-based)."""
-        violations = []
         # Look for capitalized words that might be names
         # This is a simple heuristic - in production, use NER
-        name_pattern = re.compile(r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b')
-        matches = name_pattern.finditer(text)
-        for match in matches:
+        return [
+            {
+                "type": "personal_name",
+                "severity": "medium",
+                "content": match.group(0),
+                "position": match.start(),
+            }
+            for match in _PERSONAL_NAME_RE.finditer(text)
             # Filter out common non-name patterns
-            content = match.group(0)
-            if not any(word in content.lower() for word in ["the", "this", "that", "there", "then"]):
-                violations.append({
-                    "type": "personal_name",
-                    "severity": "medium",
-                    "content": content,
-                    "position": match.start(),
-                })
-        return violations
+            if not _NAME_STOPWORD_RE.search(match.group(0))
+        ]
     
     def _detect_financial_info(self, text: str) -> List[Dict[str, Any]]:
         """Detect financial information in text."""
@@ -472,41 +541,33 @@ Return JSON with:
         Returns:
             Sanitized text with sensitive info redacted
         """
-        sanitized = text
-        # Sort violations by position (reverse order to maintain indices)
-        sorted_violations = sorted(violations, key=lambda v: v.get("position", 0), reverse=True)
-        
-        for violation in sorted_violations:
-            content = violation.get("content", "")
+        # Merge overlapping violations into single spans, labelled with the
+        # placeholder of the most severe violation in each, so no fragment of
+        # an overlapped match is left behind
+        spans = []
+        for violation in sorted(violations, key=lambda v: v.get("position", 0)):
             position = violation.get("position", 0)
-            violation_type = violation.get("type", "")
-            
-            # Create redaction placeholder
-            if violation_type == "email":
-                redaction = "[EMAIL REDACTED]"
-            elif violation_type == "phone":
-                redaction = "[PHONE REDACTED]"
-            elif violation_type == "credit_card":
-                redaction = "[CARD REDACTED]"
-            elif violation_type == "ssn":
-                redaction = "[SSN REDACTED]"
-            elif violation_type == "address":
-                redaction = "[ADDRESS REDACTED]"
-            elif violation_type == "date_of_birth":
-                redaction = "[DOB REDACTED]"
-            elif violation_type == "personal_name":
-                redaction = "[NAME REDACTED]"
-            elif violation_type == "financial_info":
-                redaction = "[FINANCIAL INFO REDACTED]"
-            elif violation_type == "health_info":
-                redaction = "[HEALTH INFO REDACTED]"
+            violation_end = position + len(violation.get("content", ""))
+            if spans and position < spans[-1][1]:
+                start, span_end, label = spans[-1]
+                if (_SEVERITY_RANK.get(violation.get("severity"), 0)
+                        > _SEVERITY_RANK.get(label.get("severity"), 0)):
+                    label = violation
+                spans[-1] = (start, max(span_end, violation_end), label)
             else:
-                redaction = "[REDACTED]"
-            
-            # Replace content with redaction
-            sanitized = sanitized[:position] + redaction + sanitized[position + len(content):]
-        
-        return sanitized
+                spans.append((position, violation_end, violation))
+        
+        # Join the untouched text between the spans with their placeholders,
+        # building the result in one pass
+        pieces = []
+        end = 0
+        for start, span_end, label in spans:
+            pieces.append(text[end:start])
+            pieces.append(_REDACT_MAP.get(label.get("type", ""), "[REDACTED]"))
+            end = span_end
+        pieces.append(text[end:])
+        
+        return "".join(pieces)
     
     def _generate_privacy_warning(
         self,
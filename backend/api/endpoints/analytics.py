@@ -1,6 +1,8 @@
 """
 Analytics endpoints for MemoryChat Multi-Agent API.
 """
+from functools import lru_cache
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
@@ -11,8 +13,18 @@ from agents.conversation_analyst_agent import ConversationAnalystAgent
 router = APIRouter()
 
 
+@lru_cache(maxsize=None)
+def _get_analyst() -> ConversationAnalystAgent:
+    """
+    Get the analyst agent shared across requests (built once per process).
+    
+    The agent keeps no per-request state, so concurrent requests can share it.
+    """
+    return ConversationAnalystAgent()
+
+
 @router.get("/sessions/{session_id}/analytics")
-async def get_session_analytics(
+def get_session_analytics(
     session_id: int,
     db: Session = Depends(get_db)
 ):
@@ -55,7 +67,7 @@ async def get_session_analytics(
         ]
         
         # Use ConversationAnalystAgent
-        analyst = ConversationAnalystAgent()
+        analyst = _get_analyst()
         agent_input = {
             "session_id": session_id,
             "user_message": "",  # Not needed for analysis
@@ -72,7 +72,7 @@ router = APIRouter()
         500: {"description": "Internal server error"}
     }
 )
-async def send_message(
+def send_message(
     request: SendMessageRequest = ...,
     db: Session = Depends(get_db)
 ):
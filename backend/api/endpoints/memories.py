@@ -4,6 +4,7 @@ Memory endpoints for MemoryChat Multi-Agent API.
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from functools import lru_cache
 import json
 
 from database.database import get_db
@@ -18,6 +19,16 @@ from models.api_models import (
 router = APIRouter()
 
 
+@lru_cache(maxsize=None)
+def _get_retrieval_agent() -> MemoryRetrievalAgent:
+    """
+    Get the retrieval agent shared across requests (built once per process).
+    
+    The agent keeps no per-request state, so concurrent requests can share it.
+    """
+    return MemoryRetrievalAgent()
+
+
 @router.get("/profiles/{profile_id}/memories", response_model=List[MemoryResponse])
 async def get_profile_memories(
     profile_id: int,
@@ -290,7 +301,7 @@ async def delete_memory(
 
 
 @router.post("/memories/search", response_model=List[MemoryResponse])
-async def search_memories(
+def search_memories(
     profile_id: int = Query(..., description="Profile ID"),
     query: str = Query(..., min_length=1, description="Search query"),
     limit: int = Query(10, ge=1, le=50, description="Maximum results"),
@@ -322,7 +333,7 @@ async def search_memories(
         memories = []
         
         # Use MemoryRetrievalAgent for semantic search
-        retrieval_agent = MemoryRetrievalAgent()
+        retrieval_agent = _get_retrieval_agent()
         agent_input = {
             "session_id": None,
             "user_message": query,
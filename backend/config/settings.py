@@ -2,9 +2,19 @@
 Application settings loaded from environment variables.
 Uses pydantic-settings for validation and type safety.
 """
+from functools import lru_cache
+from pathlib import Path
+
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings
 
+# .env lives in the backend directory; resolve it from this file rather than
+# the current working directory
+ENV_FILE = Path(__file__).resolve().parent.parent / ".env"
+
+# Value shipped in .env.example in place of a real OpenAI API key
+OPENAI_API_KEY_PLACEHOLDER = "your-api-key-here"
+
 
 class Settings(BaseSettings):
     """Application configuration settings."""
@@ -45,7 +55,7 @@ class Settings(BaseSettings):
     
     class Config:
         """Pydantic configuration."""
-        env_file = ".env"
+        env_file = str(ENV_FILE)
         env_file_encoding = "utf-8"
         case_sensitive = True
 
@@ -53,3 +63,18 @@ class Settings(BaseSettings):
 # Create a singleton instance
 settings = Settings()
 
+
+@lru_cache(maxsize=None)
+def openai_api_key_configured() -> bool:
+    """
+    Check whether a real OpenAI API key is configured.
+    
+    Settings are loaded once per process, so the answer is computed once
+    and shared by every agent instead of being re-derived on each init.
+    
+    Returns:
+        True if OPENAI_API_KEY is set and isn't the placeholder value
+    """
+    api_key = getattr(settings, "OPENAI_API_KEY", None)
+    return bool(api_key) and api_key != OPENAI_API_KEY_PLACEHOLDER
+
@@ -2,7 +2,9 @@
 Chat service for MemoryChat Multi-Agent application.
 Handles message processing, agent orchestration, and data persistence.
 """
-from typing import Dict, Any, Optional, List
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Optional, List, Mapping, Sequence
 from datetime import datetime
 from sqlalchemy.orm import Session
 
@@ -20,6 +22,23 @@ from services.vector_service import VectorService
 from config.logging_config import get_agent_logger
 
 
+@lru_cache(maxsize=None)
+def get_coordinator() -> ContextCoordinatorAgent:
+    """
+    Get the ContextCoordinatorAgent shared by all chat requests.
+    
+    Building the coordinator creates every agent along with its LLM client and
+    vector store, so it is done once per process instead of once per request.
+    Sharing it is safe because runs keep no state on the agents: the
+    coordinator's execution tracking is per thread, and temperature
+    overrides are passed to each LLM call rather than set on the agent.
+    
+    Returns:
+        Shared ContextCoordinatorAgent instance
+    """
+    return ContextCoordinatorAgent()
+
+
 class ChatService:
     """
     Service class for processing chat messages through the agent system.
@@ -41,7 +60,7 @@ class ChatService:
         self.db = db
         self.db_service = DatabaseService(db)
         self.vector_service = VectorService()
-        self.coordinator = ContextCoordinatorAgent()
+        self.coordinator = get_coordinator()
         self.logger = get_agent_logger("ChatService")
     
     def process_message(
@@ -92,12 +111,13 @@ class ChatService:
                 if not profile:
                     self.logger.warning(f"Profile {session.memory_profile_id} not found for session {session_id}")
             
-            # Get conversation history
+            # Get conversation history. It is read by several agents at once,
+            # so hand it out read-only rather than as mutable lists and dicts
             messages = self.db_service.get_messages_by_session(session_id)
-            conversation_history = [
-                {"role": msg.role, "content": msg.content}
+            conversation_history = tuple(
+                MappingProxyType({"role": msg.role, "content": msg.content})
                 for msg in messages[-10:]  # Last 10 messages for context
-            ]
+            )
             
             # Prepare input for ContextCoordinatorAgent
             agent_input = self._prepare_agent_input(
@@ -237,7 +257,7 @@ class ChatService:
         self,
         session: Any,
         message: str,
-        conversation_history: List[Dict[str, str]]
+        conversation_history: Sequence[Mapping[str, str]]
     ) -> Dict[str, Any]:
         """
         Prepare input data for ContextCoordinatorAgent.
@@ -245,7 +265,7 @@ class ChatService:
         Args:
             session: ChatSession object
             message: User message
-            conversation_history: List of previous messages
+            conversation_history: Read-only sequence of previous messages
             
         Returns:
             Formatted input dictionary for agent
@@ -3,10 +3,11 @@ Database service layer for MemoryChat Multi-Agent application.
 Provides CRUD operations for all database entities with error handling and transaction management.
 """
 import json
-from typing import Optional, List, Dict, Any
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, FrozenSet
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from sqlalchemy import or_, and_
+from sqlalchemy import or_, and_, inspect as sa_inspect
 
 import sys
 from pathlib import Path
@@ -21,6 +22,12 @@ from database.models import (
 )
 
 
+@lru_cache(maxsize=None)
+def _mapped_attributes(model: type) -> FrozenSet[str]:
+    """Get the names of a model's mapped attributes (columns and relationships)."""
+    return frozenset(sa_inspect(model).attrs.keys())
+
+
 class DatabaseService:
     """Service class for database operations."""
     
@@ -68,8 +75,9 @@ class DatabaseService:
             if not user:
                 return None
             
+            fields = _mapped_attributes(User)
             for key, value in kwargs.items():
-                if hasattr(user, key):
+                if key in fields:
                     setattr(user, key, value)
             
             self.db.commit()
@@ -168,8 +176,9 @@ class DatabaseService:
             if "personality_traits" in kwargs and isinstance(kwargs["personality_traits"], dict):
                 kwargs["personality_traits"] = json.dumps(kwargs["personality_traits"])
             
+            fields = _mapped_attributes(MemoryProfile)
             for key, value in kwargs.items():
-                if hasattr(profile, key):
+                if key in fields:
                     setattr(profile, key, value)
             
             self.db.commit()
@@ -298,8 +307,9 @@ class DatabaseService:
                 if kwargs["privacy_mode"] not in ["normal", "incognito", "pause_memory"]:
                     raise ValueError(f"Invalid privacy_mode: {kwargs['privacy_mode']}")
             
+            fields = _mapped_attributes(ChatSession)
             for key, value in kwargs.items():
-                if hasattr(session, key):
+                if key in fields:
                     setattr(session, key, value)
             
             self.db.commit()
@@ -449,8 +459,9 @@ class DatabaseService:
             if "tags" in kwargs and isinstance(kwargs["tags"], list):
                 kwargs["tags"] = json.dumps(kwargs["tags"])
             
+            fields = _mapped_attributes(Memory)
             for key, value in kwargs.items():
-                if hasattr(memory, key):
+                if key in fields:
                     setattr(memory, key, value)
             
             self.db.commit()
@@ -8,18 +8,23 @@ import os
 from pathlib import Path
 import time
 import json
+import contextlib
+import traceback
 import subprocess
 import shutil
-from typing import Dict, Any, Optional, List
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, NamedTuple
 
-# Add backend directory to path
-backend_dir = Path(__file__).parent.parent
-sys.path.insert(0, str(backend_dir))
-
-# Change to backend directory
-os.chdir(backend_dir)
+# Add backend directory to path, as a plain string computed once and only
+# if it isn't there already
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+if _BACKEND_DIR not in sys.path:
+    sys.path.insert(0, _BACKEND_DIR)
+backend_dir = Path(_BACKEND_DIR)
 
 # Load environment variables from .env file before importing anything that uses settings
+# (by absolute path, so the scripts don't depend on the working directory)
 try:
     from dotenv import load_dotenv
     env_path = backend_dir / ".env"
@@ -28,18 +33,19 @@ try:
 except ImportError:
     pass
 
-# Import settings to ensure .env is loaded
+# Import settings to ensure .env is loaded; resolve the API key once
+_API_KEY = ""
+_API_KEY_OK = False
 try:
-    from config.settings import settings
-    if hasattr(settings, 'OPENAI_API_KEY') and settings.OPENAI_API_KEY and settings.OPENAI_API_KEY != "your-api-key-here":
-        os.environ["OPENAI_API_KEY"] = settings.OPENAI_API_KEY
+    from config.settings import settings, openai_api_key_configured
+    _API_KEY = getattr(settings, "OPENAI_API_KEY", "") or ""
+    _API_KEY_OK = openai_api_key_configured()
+    if _API_KEY_OK:
+        os.environ["OPENAI_API_KEY"] = _API_KEY
 except Exception:
     pass
 
 import requests
-from database.database import SessionLocal
-from services.database_service import DatabaseService
-from services.vector_service import VectorService
 
 # Paths
 MEMORYCHAT_ROOT = backend_dir.parent
@@ -47,11 +53,54 @@ FRONTEND_DIR = MEMORYCHAT_ROOT / "frontend"
 SCRIPTS_DIR = MEMORYCHAT_ROOT / "scripts"
 DOCS_DIR = MEMORYCHAT_ROOT / "docs"
 DATA_DIR = MEMORYCHAT_ROOT / "data"
+REQUIREMENTS_FILE = backend_dir / "requirements.txt"
+
+# Existence checks as (description, path) rows, run by run_path_checks
+INSTALLATION_PATH_CHECKS = (
+    ("SQLite directory exists", DATA_DIR / "sqlite"),
+    ("ChromaDB directory exists", DATA_DIR / "chromadb"),
+    (".env.example file exists", backend_dir / ".env.example"),
+)
+FRONTEND_PATH_CHECKS = (
+    ("Frontend index.html exists", FRONTEND_DIR / "index.html"),
+    ("Frontend CSS directory exists", FRONTEND_DIR / "css"),
+    ("Frontend JS directory exists", FRONTEND_DIR / "js"),
+)
+SCRIPT_PATH_CHECKS = tuple(
+    (f"{name} exists", SCRIPTS_DIR / name)
+    for name in ("start_backend.sh", "start_frontend.sh", "start_all.sh", "stop_all.sh")
+)
+
+# Set TEST_VERBOSE=1 to print full tracebacks for unexpected errors
+VERBOSE = os.getenv("TEST_VERBOSE") == "1"
+# Set TEST_FAIL_FAST=1 to stop the functional checks at the first failure
+FAIL_FAST = os.getenv("TEST_FAIL_FAST") == "1"
+# Set TEST_JSON=1 to write a single JSON report of every check to stdout;
+# the colored checklist then goes to stderr
+JSON_OUTPUT = os.getenv("TEST_JSON") == "1"
 
 # API base URL
 BASE_URL = "http://127.0.0.1:8000"
 API_BASE = f"{BASE_URL}/api"
 
+
+class CheckRecord(NamedTuple):
+    """One check's result, kept for the JSON report."""
+    section: str
+    name: str
+    status: str
+    details: str
+
+
+# Header and check lines waiting to be written; see flush_output
+output_buffer: List[str] = []
+# Check results for the JSON report, with the section each belongs to
+check_records: List[CheckRecord] = []
+current_section = ""
+
+# Failed checks listed in the summary; failures past this are only counted
+MAX_REPORTED_ERRORS = 10
+
 # Test results tracking
 test_results = {
     "passed": 0,
@@ -80,29 +129,92 @@ class Colors:
     CYAN = '\033[96m'
 
 
+# Status label and test_results counter of a check, indexed by its passed flag
+CHECK_STATUS = (
+    (f"{Colors.RED}✗ FAIL{Colors.RESET}", "failed"),
+    (f"{Colors.GREEN}✓ PASS{Colors.RESET}", "passed"),
+)
+SKIP_STATUS = f"{Colors.YELLOW}⊘ SKIP{Colors.RESET}"
+# Fixed pieces of the header, banner and check detail lines
+HEADER_BAR = f"{Colors.BOLD}{Colors.CYAN}{'=' * 70}{Colors.RESET}"
+BANNER_BAR = "=" * 70
+DETAIL_PREFIX = f"    {Colors.BLUE}→{Colors.RESET} "
+
+
+def flush_output():
+    """Write the buffered header and check lines in a single call."""
+    if output_buffer:
+        sys.stdout.write("\n".join(output_buffer) + "\n")
+        sys.stdout.flush()
+        output_buffer.clear()
+
+
 def print_header(text: str):
-    """Print formatted header."""
-    print(f"\n{Colors.BOLD}{Colors.CYAN}{'=' * 70}{Colors.RESET}")
-    print(f"{Colors.BOLD}{Colors.CYAN}{text.center(70)}{Colors.RESET}")
-    print(f"{Colors.BOLD}{Colors.CYAN}{'=' * 70}{Colors.RESET}\n")
+    """Print formatted header, flushing the previous section's output first."""
+    global current_section
+    current_section = text
+    flush_output()
+    output_buffer.append("\n" + HEADER_BAR)
+    output_buffer.append(f"{Colors.BOLD}{Colors.CYAN}{text.center(70)}{Colors.RESET}")
+    output_buffer.append(HEADER_BAR + "\n")
+
+
+def print_banner(title: str, intro: str):
+    """Print the script's title banner and introduction in a single write."""
+    sys.stdout.write(
+        f"\n{Colors.BOLD}{Colors.CYAN}\n{BANNER_BAR}\n{title.center(70)}\n{BANNER_BAR}\n{Colors.RESET}\n\n"
+        f"{intro}\n"
+        f"{Colors.YELLOW}Note: Some tests require the backend server to be running.{Colors.RESET}\n\n"
+    )
+    sys.stdout.flush()
 
 
 def print_check(name: str, passed: bool, details: str = "", skipped: bool = False):
     """Print checklist item result."""
     if skipped:
-        status = f"{Colors.YELLOW}⊘ SKIP{Colors.RESET}"
+        status = SKIP_STATUS
         test_results["skipped"] += 1
-    elif passed:
-        status = f"{Colors.GREEN}✓ PASS{Colors.RESET}"
-        test_results["passed"] += 1
     else:
-        status = f"{Colors.RED}✗ FAIL{Colors.RESET}"
-        test_results["failed"] += 1
-        test_results["errors"].append(f"{name}: {details}")
-    
-    print(f"  {status}: {name}")
+        status, counter = CHECK_STATUS[bool(passed)]
+        test_results[counter] += 1
+        # Only the failures the summary lists are formatted and kept
+        if not passed and len(test_results["errors"]) < MAX_REPORTED_ERRORS:
+            test_results["errors"].append(f"{name}: {details}")
+    
+    if JSON_OUTPUT:
+        check_records.append(CheckRecord(current_section, name, "skipped" if skipped else counter, str(details)))
+    output_buffer.append(f"  {status}: {name}")
     if details:
-        print(f"    {Colors.BLUE}→{Colors.RESET} {details}")
+        output_buffer.append(f"{DETAIL_PREFIX}{details}")
+
+
+def skip_without_api_key(name: str) -> bool:
+    """
+    Report a check as skipped when no OpenAI API key is configured.
+    
+    Without a key the chat endpoint answers with a fallback reply and stores
+    no memories, so checks built on chat messages would pass vacuously.
+    
+    Args:
+        name: Checklist item name
+        
+    Returns:
+        True if the check was skipped
+    """
+    if _API_KEY_OK:
+        return False
+    print_check(name, True, "OpenAI API key not configured", skipped=True)
+    return True
+
+
+def exception_summary(e: BaseException) -> str:
+    """
+    Describe an exception as its type and message, without a traceback.
+    
+    format_exception_only skips walking the stack frames; the full
+    traceback is only printed when TEST_VERBOSE=1.
+    """
+    return "".join(traceback.format_exception_only(type(e), e)).strip()
 
 
 def api_request(method: str, endpoint: str, data: Optional[Dict] = None, params: Optional[Dict] = None) -> Optional[Dict]:
@@ -120,30 +232,23 @@ def api_request(method: str, endpoint: str, data: Optional[Dict] = None, params:
         else:
             return None
         
-        # Handle response
-        if response.content:
-            try:
-                json_data = response.json()
-                # FastAPI endpoints that return lists directly will have the list as the JSON response
-                # Endpoints that return models will have the model fields directly
-                return {
-                    "status_code": response.status_code,
-                    "data": json_data,
-                    "success": 200 <= response.status_code < 300
-                }
-            except ValueError:
-                # Not JSON response
-                return {
-                    "status_code": response.status_code,
-                    "data": response.text,
-                    "success": 200 <= response.status_code < 300
-                }
+        # Handle response; decide how to read the body from its content type
+        # rather than attempting a JSON parse and catching the failure
+        if not response.content:
+            data = None
+        elif response.headers.get("content-type", "").startswith("application/json"):
+            # FastAPI endpoints that return lists directly will have the list as the JSON response
+            # Endpoints that return models will have the model fields directly
+            data = response.json()
         else:
-            return {
-                "status_code": response.status_code,
-                "data": None,
-                "success": 200 <= response.status_code < 300
-            }
+            # Not JSON response
+            data = response.text
+        
+        return {
+            "status_code": response.status_code,
+            "data": data,
+            "success": 200 <= response.status_code < 300
+        }
     except requests.exceptions.ConnectionError:
         return {"error": "Connection refused - is the server running?", "success": False}
     except Exception as e:
@@ -173,26 +278,118 @@ def wait_for_server(max_retries=30):
     return False
 
 
+@lru_cache(maxsize=None)
+def _dir_listing(dir_path: str) -> Dict[str, bool]:
+    """
+    List a directory once and remember its entries.
+    
+    The checks below probe many files in the same few directories, so one
+    scandir per directory replaces a stat() call per probed path.
+    
+    Args:
+        dir_path: Directory to list
+        
+    Returns:
+        Dictionary mapping entry name to whether it is a directory
+        (empty if the directory doesn't exist)
+    """
+    try:
+        with os.scandir(dir_path) as entries:
+            return {entry.name: entry.is_dir() for entry in entries}
+    except OSError:
+        return {}
+
+
+def prefetch_static_inputs():
+    """
+    List every directory the static checks probe in one concurrent pass.
+    
+    Fills the _dir_listing cache, so the existence checks later run purely
+    in memory. The listings are independent and I/O-bound, so they overlap
+    instead of running one at a time as each section reaches them. The
+    logs directory is left out since the server may still be writing to it.
+    """
+    checked_dirs = (
+        MEMORYCHAT_ROOT, backend_dir, DATA_DIR, DATA_DIR / "sqlite",
+        FRONTEND_DIR, FRONTEND_DIR / "css", FRONTEND_DIR / "js", SCRIPTS_DIR,
+    )
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(_dir_listing, map(str, checked_dirs)))
+
+
+def path_exists(path: Path) -> bool:
+    """Check if a file or directory exists."""
+    return path.name in _dir_listing(str(path.parent))
+
+
+def dir_exists(path: Path) -> bool:
+    """Check if a directory exists."""
+    return _dir_listing(str(path.parent)).get(path.name, False)
+
+
+def file_exists(path: Path) -> bool:
+    """Check if a file (not a directory) exists."""
+    return _dir_listing(str(path.parent)).get(path.name) is False
+
+
+@lru_cache(maxsize=None)
+def read_if_exists(path: Path) -> Optional[bytes]:
+    """
+    Read a file's bytes, or return None without touching it if it's missing.
+    
+    Existence comes from the cached directory listing, so a missing file
+    costs no syscall and callers need no separate exists/open branches.
+    Contents are cached; only static project files are read this way.
+    
+    Args:
+        path: File to read
+        
+    Returns:
+        File contents, or None if the file doesn't exist
+    """
+    if not file_exists(path):
+        return None
+    return path.read_bytes()
+
+
+def run_path_checks(checks) -> List[bool]:
+    """
+    Run a table of existence checks, reporting each one.
+    
+    Args:
+        checks: Iterable of (description, path) rows
+        
+    Returns:
+        Whether each path exists, in row order
+    """
+    results = []
+    for description, path in checks:
+        exists = path_exists(path)
+        print_check(description, exists, str(path))
+        results.append(exists)
+    return results
+
+
 def check_file_exists(file_path: Path, description: str) -> bool:
     """Check if file exists."""
-    exists = file_path.exists() and file_path.is_file()
+    exists = file_exists(file_path)
     print_check(description, exists, str(file_path) if exists else f"File not found: {file_path}")
     return exists
 
 
 def check_dir_exists(dir_path: Path, description: str) -> bool:
     """Check if directory exists."""
-    exists = dir_path.exists() and dir_path.is_dir()
+    exists = dir_exists(dir_path)
     print_check(description, exists, str(dir_path) if exists else f"Directory not found: {dir_path}")
     return exists
 
 
 def check_script_executable(script_path: Path, description: str) -> bool:
     """Check if script exists and is executable."""
-    exists = script_path.exists() and script_path.is_file()
+    exists = file_exists(script_path)
     if exists:
         # Check if it's executable (Unix) or has .sh/.bat extension (Windows)
-        is_executable = os.access(script_path, os.X_OK) or script_path.suffix in ['.sh', '.bat']
+        is_executable = os.access(script_path, os.X_OK) or script_path.suffix in ('.sh', '.bat')
         print_check(description, is_executable, str(script_path))
         return is_executable
     else:
@@ -209,35 +406,28 @@ def test_fresh_installation():
     print_header("SECTION 1: FRESH INSTALLATION CHECKS")
     
     # Check requirements.txt exists
-    req_file = backend_dir / "requirements.txt"
-    print_check("Requirements file exists", req_file.exists(), str(req_file))
+    requirements_exists = file_exists(REQUIREMENTS_FILE)
+    print_check("Requirements file exists", requirements_exists, str(REQUIREMENTS_FILE))
     
-    # Check if dependencies can be checked
-    if req_file.exists():
+    # Check if dependencies can be checked; a read error fails this check
+    # rather than aborting the checklist
+    if requirements_exists:
         try:
-            with open(req_file, 'r') as f:
-                requirements = f.read()
-                has_deps = len(requirements.strip()) > 0
-                print_check("Dependencies listed correctly", has_deps, 
-                           f"Found {len(requirements.splitlines())} lines" if has_deps else "File is empty")
+            requirements = read_if_exists(REQUIREMENTS_FILE)
+            has_deps = len(requirements.strip()) > 0
+            print_check("Dependencies listed correctly", has_deps, 
+                       f"Found {len(requirements.splitlines())} lines" if has_deps else "File is empty")
         except Exception as e:
             print_check("Dependencies listed correctly", False, str(e))
     
     # Check database initialization
     db_path = DATA_DIR / "sqlite" / "memorychat.db"
-    db_exists = db_path.exists()
+    db_exists = path_exists(db_path)
     print_check("Database initializes properly", db_exists, 
                str(db_path) if db_exists else "Database file not found (may need initialization)")
     
-    # Check database directory structure
-    sqlite_dir = DATA_DIR / "sqlite"
-    chromadb_dir = DATA_DIR / "chromadb"
-    print_check("SQLite directory exists", sqlite_dir.exists(), str(sqlite_dir))
-    print_check("ChromaDB directory exists", chromadb_dir.exists(), str(chromadb_dir))
-    
-    # Check .env.example exists
-    env_example = backend_dir / ".env.example"
-    print_check(".env.example file exists", env_example.exists(), str(env_example))
+    # Check database directory structure and .env.example
+    run_path_checks(INSTALLATION_PATH_CHECKS)
 
 
 # ============================================================================
@@ -271,21 +461,12 @@ def test_frontend_startup():
     print_header("FRONTEND STARTUP CHECKS")
     
     # Check frontend directory exists
-    frontend_exists = FRONTEND_DIR.exists() and FRONTEND_DIR.is_dir()
+    frontend_exists = dir_exists(FRONTEND_DIR)
     print_check("Frontend directory exists", frontend_exists, str(FRONTEND_DIR))
     
     if frontend_exists:
-        # Check main HTML file
-        index_html = FRONTEND_DIR / "index.html"
-        print_check("Frontend index.html exists", index_html.exists(), str(index_html))
-        
-        # Check CSS directory
-        css_dir = FRONTEND_DIR / "css"
-        print_check("Frontend CSS directory exists", css_dir.exists(), str(css_dir))
-        
-        # Check JS directory
-        js_dir = FRONTEND_DIR / "js"
-        print_check("Frontend JS directory exists", js_dir.exists(), str(js_dir))
+        # Check main HTML file, CSS and JS directories
+        run_path_checks(FRONTEND_PATH_CHECKS)
         
         # Check if frontend can be served (check if HTTP server can start)
         # This is a basic check - actual serving would require a running server
@@ -373,6 +554,9 @@ def test_send_messages():
     """Test sending messages and getting responses."""
     print_header("SEND MESSAGES AND GET RESPONSES")
     
+    if skip_without_api_key("Can send messages and get responses"):
+        return True
+    
     if not test_data["session_ids"]:
         print_check("Can send messages and get responses", False, "No session ID available")
         return False
@@ -445,6 +629,9 @@ def test_memories_used_in_context():
     """Test memories are used in context."""
     print_header("MEMORIES USED IN CONTEXT")
     
+    if skip_without_api_key("Memories are used in context"):
+        return True
+    
     if not test_data["session_ids"] or not test_data["profile_ids"]:
         print_check("Memories are used in context", False, "No session or profile available")
         return False
@@ -498,6 +685,9 @@ def test_incognito_mode():
     """Test Incognito mode blocks memory storage."""
     print_header("INCOGNITO MODE - BLOCKS MEMORY STORAGE")
     
+    if skip_without_api_key("Incognito mode blocks memory storage"):
+        return True
+    
     if not test_data["user_id"] or not test_data["profile_ids"]:
         print_check("Incognito mode blocks memory storage", False, "No user or profile available")
         return False
@@ -554,6 +744,9 @@ def test_pause_memory_mode():
     """Test Pause Memory mode prevents new memories."""
     print_header("PAUSE MEMORY MODE - PREVENTS NEW MEMORIES")
     
+    if skip_without_api_key("Pause Memory mode prevents new memories"):
+        return True
+    
     if not test_data["user_id"] or not test_data["profile_ids"]:
         print_check("Pause Memory mode prevents new memories", False, "No user or profile available")
         return False
@@ -610,6 +803,9 @@ def test_privacy_guardian_pii_detection():
     """Test Privacy Guardian detects PII."""
     print_header("PRIVACY GUARDIAN DETECTS PII")
     
+    if skip_without_api_key("Privacy Guardian detects PII"):
+        return True
+    
     if not test_data["session_ids"]:
         print_check("Privacy Guardian detects PII", False, "No session available")
         return False
@@ -842,15 +1038,16 @@ def test_logs_generating():
     print_header("SECTION 4: SYSTEM CHECKS - LOGS GENERATING")
     
     logs_dir = backend_dir / "logs"
-    logs_exist = logs_dir.exists() and logs_dir.is_dir()
+    logs_exist = dir_exists(logs_dir)
     print_check("Logs directory exists", logs_exist, str(logs_dir))
     
     if logs_exist:
-        # Check for common log files
+        # Check for common log files; both come from the one cached listing
+        # of logs/, so neither costs a stat()
         app_log = logs_dir / "app.log"
         errors_log = logs_dir / "errors.log"
-        has_app_log = app_log.exists()
-        has_errors_log = errors_log.exists()
+        has_app_log = path_exists(app_log)
+        has_errors_log = path_exists(errors_log)
         
         print_check("App log file exists", has_app_log, str(app_log) if has_app_log else "Not found")
         print_check("Errors log file exists", has_errors_log, str(errors_log) if has_errors_log else "Not found")
@@ -882,7 +1079,7 @@ def test_error_handling():
     invalid_user_data = {"email": "invalid-email", "username": ""}
     response = api_request("POST", "/users", invalid_user_data)
     if response:
-        is_validation_error = response.get("status_code") in [400, 422]
+        is_validation_error = response.get("status_code") in (400, 422)
         print_check("Error handling working (validation)", is_validation_error, 
                    f"Status: {response.get('status_code')}" if is_validation_error else "Expected 400/422")
     
@@ -898,16 +1095,16 @@ def test_ui_responsive():
     css_dir = FRONTEND_DIR / "css"
     js_dir = FRONTEND_DIR / "js"
     
-    has_html = index_html.exists()
-    has_css = css_dir.exists() and any(css_dir.glob("*.css"))
-    has_js = js_dir.exists() and any(js_dir.glob("*.js"))
+    has_html = path_exists(index_html)
+    has_css = any(name.endswith(".css") for name in _dir_listing(str(css_dir)))
+    has_js = any(name.endswith(".js") for name in _dir_listing(str(js_dir)))
     
     print_check("UI files exist", has_html and has_css and has_js, 
                f"HTML: {has_html}, CSS: {has_css}, JS: {has_js}")
     
     # Check if config.js exists (for API URL)
-    config_js = js_dir / "config.js" if js_dir.exists() else None
-    if config_js and config_js.exists():
+    config_js = js_dir / "config.js"
+    if path_exists(config_js):
         print_check("UI configuration exists", True, str(config_js))
     else:
         print_check("UI configuration exists", False, "config.js not found")
@@ -923,10 +1120,10 @@ def test_documentation_accurate():
     # Check for key documentation files
     readme = MEMORYCHAT_ROOT / "README.md"
     
-    print_check("README.md exists", readme.exists(), str(readme))
+    print_check("README.md exists", path_exists(readme), str(readme))
     
     # Check docs directory
-    docs_exist = DOCS_DIR.exists() and DOCS_DIR.is_dir()
+    docs_exist = dir_exists(DOCS_DIR)
     print_check("Documentation directory exists", docs_exist, str(DOCS_DIR))
     
     print_check("Documentation is accurate", True, "Documentation files are present (accuracy requires manual review)")
@@ -937,18 +1134,11 @@ def test_scripts_work():
     print_header("SCRIPTS WORK CORRECTLY")
     
     # Check startup scripts
-    start_backend = SCRIPTS_DIR / "start_backend.sh"
-    start_frontend = SCRIPTS_DIR / "start_frontend.sh"
-    start_all = SCRIPTS_DIR / "start_all.sh"
-    stop_all = SCRIPTS_DIR / "stop_all.sh"
-    
-    print_check("start_backend.sh exists", start_backend.exists(), str(start_backend))
-    print_check("start_frontend.sh exists", start_frontend.exists(), str(start_frontend))
-    print_check("start_all.sh exists", start_all.exists(), str(start_all))
-    print_check("stop_all.sh exists", stop_all.exists(), str(stop_all))
+    scripts_exist = run_path_checks(SCRIPT_PATH_CHECKS)
     
     # Check if scripts are executable (on Unix)
-    if start_backend.exists():
+    start_backend = SCRIPT_PATH_CHECKS[0][1]
+    if scripts_exist[0]:
         is_executable = os.access(start_backend, os.X_OK)
         print_check("Scripts are executable", is_executable, 
                    "Scripts have execute permissions" if is_executable else "Scripts may need chmod +x")
@@ -960,16 +1150,44 @@ def test_scripts_work():
 # MAIN EXECUTION
 # ============================================================================
 
+# Section 3 checks, in order; later checks build on the users, profiles and
+# sessions earlier ones create
+FUNCTIONAL_CHECKS = (
+    test_user_creation,
+    test_memory_profile_creation,
+    test_chat_session_creation,
+    test_send_messages,
+    test_memories_created_normal_mode,
+    test_memories_used_in_context,
+    test_incognito_mode,
+    test_pause_memory_mode,
+    test_privacy_guardian_pii_detection,
+    test_profile_switching,
+    test_profile_switching_resets_context,
+    test_no_cross_profile_memory_leakage,
+    test_view_memories,
+    test_delete_memories,
+    test_delete_sessions,
+)
+
+
+def run_functional_checks():
+    """Run the functional checks, stopping at the first failure if FAIL_FAST is set."""
+    failed_before = test_results["failed"]
+    for check in FUNCTIONAL_CHECKS:
+        check()
+        if FAIL_FAST and test_results["failed"] > failed_before:
+            flush_output()
+            print(f"\n{Colors.YELLOW}Stopping functional tests after the first failure (TEST_FAIL_FAST=1).{Colors.RESET}")
+            return
+
+
 def main():
     """Run all tests."""
-    print(f"\n{Colors.BOLD}{Colors.CYAN}")
-    print("=" * 70)
-    print("PHASE 9 STEP 9.1: FINAL TESTING CHECKLIST".center(70))
-    print("=" * 70)
-    print(f"{Colors.RESET}\n")
+    print_banner("PHASE 9 STEP 9.1: FINAL TESTING CHECKLIST",
+                 f"{Colors.BOLD}This script verifies all checklist items from Phase 9 Step 9.1{Colors.RESET}")
     
-    print(f"{Colors.BOLD}This script verifies all checklist items from Phase 9 Step 9.1{Colors.RESET}")
-    print(f"{Colors.YELLOW}Note: Some tests require the backend server to be running.{Colors.RESET}\n")
+    prefetch_static_inputs()
     
     # Section 1: Fresh Installation
     test_fresh_installation()
@@ -979,30 +1197,19 @@ def main():
     test_frontend_startup()
     
     # Section 3: Functional Requirements (only if backend is running)
+    flush_output()
     if backend_running:
         print(f"\n{Colors.YELLOW}Backend is running. Proceeding with functional tests...{Colors.RESET}\n")
         time.sleep(1)  # Brief pause
         
-        test_user_creation()
-        test_memory_profile_creation()
-        test_chat_session_creation()
-        test_send_messages()
-        test_memories_created_normal_mode()
-        test_memories_used_in_context()
-        test_incognito_mode()
-        test_pause_memory_mode()
-        test_privacy_guardian_pii_detection()
-        test_profile_switching()
-        test_profile_switching_resets_context()
-        test_no_cross_profile_memory_leakage()
-        test_view_memories()
-        test_delete_memories()
-        test_delete_sessions()
+        run_functional_checks()
     else:
-        print(f"\n{Colors.YELLOW}Skipping functional tests - backend server is not running.{Colors.RESET}")
-        print(f"{Colors.BLUE}To run functional tests, start the backend server:{Colors.RESET}")
-        print(f"  {Colors.CYAN}cd memorychat{Colors.RESET}")
-        print(f"  {Colors.CYAN}./scripts/start_backend.sh{Colors.RESET}\n")
+        sys.stdout.write(
+            f"\n{Colors.YELLOW}Skipping functional tests - backend server is not running.{Colors.RESET}\n"
+            f"{Colors.BLUE}To run functional tests, start the backend server:{Colors.RESET}\n"
+            f"  {Colors.CYAN}cd memorychat{Colors.RESET}\n"
+            f"  {Colors.CYAN}./scripts/start_backend.sh{Colors.RESET}\n\n"
+        )
     
     # Section 4: System Checks
     test_logs_generating()
@@ -1018,42 +1225,66 @@ def main():
     total = test_results["passed"] + test_results["failed"] + test_results["skipped"]
     pass_rate = (test_results["passed"] / total * 100) if total > 0 else 0
     
-    print(f"  {Colors.BOLD}Total Checks:{Colors.RESET} {total}")
-    print(f"  {Colors.GREEN}Passed:{Colors.RESET} {test_results['passed']}")
-    print(f"  {Colors.RED}Failed:{Colors.RESET} {test_results['failed']}")
-    print(f"  {Colors.YELLOW}Skipped:{Colors.RESET} {test_results['skipped']}")
-    print(f"  {Colors.BOLD}Pass Rate:{Colors.RESET} {pass_rate:.1f}%")
-    
-    if test_results["errors"]:
-        print(f"\n{Colors.RED}Errors:{Colors.RESET}")
-        for error in test_results["errors"][:10]:  # Show first 10 errors
-            print(f"  - {error}")
-        if len(test_results["errors"]) > 10:
-            print(f"  ... and {len(test_results['errors']) - 10} more")
-    
-    print()
-    
-    # Final verdict
+    summary = [
+        f"  {Colors.BOLD}Total Checks:{Colors.RESET} {total}",
+        f"  {Colors.GREEN}Passed:{Colors.RESET} {test_results['passed']}",
+        f"  {Colors.RED}Failed:{Colors.RESET} {test_results['failed']}",
+        f"  {Colors.YELLOW}Skipped:{Colors.RESET} {test_results['skipped']}",
+        f"  {Colors.BOLD}Pass Rate:{Colors.RESET} {pass_rate:.1f}%",
+    ]
+    
+    # The summary reads the counters kept by print_check; nothing is rescanned
+    if test_results["failed"]:
+        summary.append(f"\n{Colors.RED}Errors:{Colors.RESET}")
+        summary.extend(f"  - {error}" for error in test_results["errors"])
+        unlisted = test_results["failed"] - len(test_results["errors"])
+        if unlisted:
+            summary.append(f"  ... and {unlisted} more")
+    
+    # Final verdict, written with the summary in the same call
     if test_results["failed"] == 0:
-        print(f"{Colors.GREEN}{Colors.BOLD}✓ CHECKPOINT 9.1: ALL REQUIREMENTS MET{Colors.RESET}")
-        print(f"{Colors.GREEN}Application is fully functional and ready for delivery.{Colors.RESET}\n")
-        return 0
+        summary.append(f"\n{Colors.GREEN}{Colors.BOLD}✓ CHECKPOINT 9.1: ALL REQUIREMENTS MET{Colors.RESET}")
+        summary.append(f"{Colors.GREEN}Application is fully functional and ready for delivery.{Colors.RESET}\n")
     else:
-        print(f"{Colors.YELLOW}{Colors.BOLD}⚠ CHECKPOINT 9.1: SOME REQUIREMENTS NOT MET{Colors.RESET}")
-        print(f"{Colors.YELLOW}Please review the failed checks above.{Colors.RESET}\n")
-        return 1
+        summary.append(f"\n{Colors.YELLOW}{Colors.BOLD}⚠ CHECKPOINT 9.1: SOME REQUIREMENTS NOT MET{Colors.RESET}")
+        summary.append(f"{Colors.YELLOW}Please review the failed checks above.{Colors.RESET}\n")
+    flush_output()
+    sys.stdout.write("\n".join(summary) + "\n")
+    sys.stdout.flush()
+    return 0 if test_results["failed"] == 0 else 1
+
+
+def write_json_report():
+    """Write the counts and every recorded check to stdout as one JSON document."""
+    report = {
+        "passed": test_results["passed"],
+        "failed": test_results["failed"],
+        "skipped": test_results["skipped"],
+        "checks": [record._asdict() for record in check_records],
+    }
+    sys.stdout.write(json.dumps(report, indent=2) + "\n")
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":
+    # In JSON mode keep stdout for the report alone; the checklist, the
+    # summary and any error go to stderr, and the report is written even if
+    # main() raises
+    output = contextlib.redirect_stdout(sys.stderr) if JSON_OUTPUT else contextlib.nullcontext()
+    exit_code = 1
     try:
-        exit_code = main()
-        sys.exit(exit_code)
-    except KeyboardInterrupt:
-        print(f"\n\n{Colors.YELLOW}Test interrupted by user.{Colors.RESET}")
-        sys.exit(1)
-    except Exception as e:
-        print(f"\n\n{Colors.RED}Unexpected error: {e}{Colors.RESET}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
-
+        with output:
+            try:
+                exit_code = main()
+            except KeyboardInterrupt:
+                flush_output()
+                print(f"\n\n{Colors.YELLOW}Test interrupted by user.{Colors.RESET}")
+            except Exception as e:
+                flush_output()
+                print(f"\n\n{Colors.RED}Unexpected error: {exception_summary(e)}{Colors.RESET}")
+                if VERBOSE:
+                    traceback.print_exc()
+    finally:
+        if JSON_OUTPUT:
+            write_json_report()
+    sys.exit(exit_code)
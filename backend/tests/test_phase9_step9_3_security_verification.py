@@ -8,17 +8,24 @@ import os
 from pathlib import Path
 import time
 import json
+import mmap
+import traceback
 import re
-from typing import Dict, Any, Optional, List
+import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Callable, Tuple
 
-# Add backend directory to path
-backend_dir = Path(__file__).parent
-sys.path.insert(0, str(backend_dir))
-
-# Change to backend directory
-os.chdir(backend_dir)
+# Add backend directory to path, as a plain string computed once and only
+# if it isn't there already
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+if _BACKEND_DIR not in sys.path:
+    sys.path.insert(0, _BACKEND_DIR)
+backend_dir = Path(_BACKEND_DIR)
 
 # Load environment variables from .env file before importing anything that uses settings
+# (by absolute path, so the scripts don't depend on the working directory)
 try:
     from dotenv import load_dotenv
     env_path = backend_dir / ".env"
@@ -27,11 +34,15 @@ try:
 except ImportError:
     pass
 
-# Import settings to ensure .env is loaded
+# Import settings to ensure .env is loaded; resolve the API key once
+_API_KEY = ""
+_API_KEY_OK = False
 try:
-    from config.settings import settings
-    if hasattr(settings, 'OPENAI_API_KEY') and settings.OPENAI_API_KEY and settings.OPENAI_API_KEY != "your-api-key-here":
-        os.environ["OPENAI_API_KEY"] = settings.OPENAI_API_KEY
+    from config.settings import settings, openai_api_key_configured
+    _API_KEY = getattr(settings, "OPENAI_API_KEY", "") or ""
+    _API_KEY_OK = openai_api_key_configured()
+    if _API_KEY_OK:
+        os.environ["OPENAI_API_KEY"] = _API_KEY
 except Exception:
     pass
 
@@ -42,11 +53,75 @@ from services.database_service import DatabaseService
 # Paths
 MEMORYCHAT_ROOT = backend_dir.parent
 LOGS_DIR = backend_dir / "logs"
+LOG_FILES = (LOGS_DIR / "app.log", LOGS_DIR / "errors.log")
+ERROR_HANDLER_FILE = backend_dir / "services" / "error_handler.py"
+
+# Set TEST_VERBOSE=1 to print full tracebacks for unexpected errors
+VERBOSE = os.getenv("TEST_VERBOSE") == "1"
 
 # API base URL
 BASE_URL = "http://127.0.0.1:8000"
 API_BASE = f"{BASE_URL}/api"
 
+# Request payloads shared by several checks (api_request never modifies them)
+TEST_PROFILE_DATA = {"name": "Test Profile", "description": "Test"}
+INVALID_USER_DATA = {"email": "invalid", "username": ""}
+
+# Patterns the data protection checks look for, as (name, regex) pairs
+API_KEY_PATTERNS = (
+    ("OpenAI API Key", r'sk-[a-zA-Z0-9]{20,}'),
+    ("API Key Pattern", r'api[_-]?key["\s:=]+([a-zA-Z0-9\-_]{20,})'),
+)
+SENSITIVE_PATTERNS = (
+    ("Email addresses", r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
+    ("Phone numbers", r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'),
+    ("SSN", r'\b\d{3}-\d{2}-\d{4}\b'),
+    ("Credit cards", r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b'),
+)
+# Matches containing these are test data rather than real leaks
+TEST_DATA_WORDS = (b'test', b'example', b'sample', b'demo')
+
+# Payloads the SQL injection check submits
+SQL_INJECTION_PAYLOADS = (
+    "'; DROP TABLE users; --",
+    "' OR '1'='1",
+    "1' UNION SELECT * FROM users--",
+    "admin'--",
+)
+# Status codes of a request the API rejected as invalid
+VALIDATION_STATUS_CODES = (400, 422)
+# Patterns that must not appear in error responses, as (name, regex) pairs
+ERROR_RESPONSE_PATTERNS = (
+    ("API Key", r'sk-[a-zA-Z0-9]{20,}'),
+    ("Email", r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
+    ("Database path", r'/[\w/]+\.(db|sqlite)'),
+)
+# Text that marks a stack trace in an error response, lowercased for
+# case-insensitive matching
+STACK_TRACE_INDICATORS = tuple(indicator.lower() for indicator in (
+    "Traceback",
+    "File \"",
+    "line ",
+    "at 0x",
+    "Exception:",
+    "Error:",
+    "TypeError:",
+    "ValueError:",
+    "AttributeError:",
+))
+
+# Exceptions and helpers the error handler must define
+REQUIRED_ERROR_HANDLERS = (
+    "MemoryChatException", "DatabaseException", "UserNotFoundException",
+    "ProfileNotFoundException", "SessionNotFoundException", "ValidationException",
+    "handle_exception", "format_error_message",
+)
+# Name of each top-level or nested def/class statement in Python source
+DEF_RE = re.compile(rb"^\s*(?:async\s+def|def|class)\s+([A-Za-z_]\w*)", re.MULTILINE)
+
+# Failed checks listed in the summary; failures past this are only counted
+MAX_REPORTED_ERRORS = 10
+
 # Test results tracking
 test_results = {
     "passed": 0,
@@ -55,6 +130,13 @@ test_results = {
     "errors": []
 }
 
+# Guards test_results when checks run in parallel
+results_lock = threading.Lock()
+
+# Per-thread output buffer: a check running in a worker thread writes here and
+# main() prints the buffer once the check finishes, keeping sections in order
+thread_output = threading.local()
+
 
 class Colors:
     """ANSI color codes."""
@@ -67,29 +149,119 @@ class Colors:
     CYAN = '\033[96m'
 
 
+# Status label and test_results counter of a check, indexed by its passed flag
+CHECK_STATUS = (
+    (f"{Colors.RED}✗ FAIL{Colors.RESET}", "failed"),
+    (f"{Colors.GREEN}✓ PASS{Colors.RESET}", "passed"),
+)
+SKIP_STATUS = f"{Colors.YELLOW}⊘ SKIP{Colors.RESET}"
+# Fixed pieces of the header, banner and check detail lines
+HEADER_BAR = f"{Colors.BOLD}{Colors.CYAN}{'=' * 70}{Colors.RESET}"
+BANNER_BAR = "=" * 70
+DETAIL_PREFIX = f"    {Colors.BLUE}→{Colors.RESET} "
+# Fixed notices and verdicts, formatted once and each written in one call
+SKIPPED_TESTS_NOTICE = f"{Colors.YELLOW}Some tests will be skipped.{Colors.RESET}\n\n"
+SERVER_UNHEALTHY_NOTICE = f"{Colors.RED}Backend server is not running or not healthy.{Colors.RESET}\n" + SKIPPED_TESTS_NOTICE
+SERVER_DOWN_NOTICE = f"{Colors.RED}Backend server is not running.{Colors.RESET}\n" + SKIPPED_TESTS_NOTICE
+VERDICT_PASSED = (
+    f"{Colors.GREEN}{Colors.BOLD}✓ CHECKPOINT 9.3: ALL SECURITY REQUIREMENTS MET{Colors.RESET}\n"
+    f"{Colors.GREEN}Privacy enforced correctly, data protected, no security vulnerabilities found.{Colors.RESET}\n"
+    f"{Colors.GREEN}Application is ready for use.{Colors.RESET}\n\n"
+)
+VERDICT_FAILED = (
+    f"{Colors.YELLOW}{Colors.BOLD}⚠ CHECKPOINT 9.3: SOME SECURITY REQUIREMENTS NOT MET{Colors.RESET}\n"
+    f"{Colors.YELLOW}Please review the failed security checks above.{Colors.RESET}\n\n"
+)
+
+
+def emit(line: str = ""):
+    """Print a line, or buffer it when running inside a parallel check."""
+    buffer = getattr(thread_output, "lines", None)
+    if buffer is None:
+        print(line)
+    else:
+        buffer.append(line)
+
+
 def print_header(text: str):
-    """Print formatted header."""
-    print(f"\n{Colors.BOLD}{Colors.CYAN}{'=' * 70}{Colors.RESET}")
-    print(f"{Colors.BOLD}{Colors.CYAN}{text.center(70)}{Colors.RESET}")
-    print(f"{Colors.BOLD}{Colors.CYAN}{'=' * 70}{Colors.RESET}\n")
+    """Print formatted header through a single emit() call."""
+    emit(
+        f"\n{HEADER_BAR}\n"
+        f"{Colors.BOLD}{Colors.CYAN}{text.center(70)}{Colors.RESET}\n"
+        f"{HEADER_BAR}\n"
+    )
+
+
+def print_banner(title: str, intro: str):
+    """Print the script's title banner and introduction in a single write."""
+    sys.stdout.write(
+        f"\n{Colors.BOLD}{Colors.CYAN}\n{BANNER_BAR}\n{title.center(70)}\n{BANNER_BAR}\n{Colors.RESET}\n\n"
+        f"{intro}\n"
+        f"{Colors.YELLOW}Note: Some tests require the backend server to be running.{Colors.RESET}\n\n"
+    )
+    sys.stdout.flush()
 
 
 def print_check(name: str, passed: bool, details: str = "", skipped: bool = False):
     """Print checklist item result."""
-    if skipped:
-        status = f"{Colors.YELLOW}⊘ SKIP{Colors.RESET}"
-        test_results["skipped"] += 1
-    elif passed:
-        status = f"{Colors.GREEN}✓ PASS{Colors.RESET}"
-        test_results["passed"] += 1
-    else:
-        status = f"{Colors.RED}✗ FAIL{Colors.RESET}"
-        test_results["failed"] += 1
-        test_results["errors"].append(f"{name}: {details}")
+    with results_lock:
+        if skipped:
+            status = SKIP_STATUS
+            test_results["skipped"] += 1
+        else:
+            status, counter = CHECK_STATUS[bool(passed)]
+            test_results[counter] += 1
+            # Only the failures the summary lists are formatted and kept
+            if not passed and len(test_results["errors"]) < MAX_REPORTED_ERRORS:
+                test_results["errors"].append(f"{name}: {details}")
     
-    print(f"  {status}: {name}")
+    emit(f"  {status}: {name}")
     if details:
-        print(f"    {Colors.BLUE}→{Colors.RESET} {details}")
+        emit(f"{DETAIL_PREFIX}{details}")
+
+
+def skip_without_api_key(name: str) -> bool:
+    """
+    Report a check as skipped when no OpenAI API key is configured.
+    
+    Without a key the chat endpoint answers with a fallback reply and stores
+    no memories, so checks built on chat messages would pass vacuously.
+    
+    Args:
+        name: Checklist item name
+        
+    Returns:
+        True if the check was skipped
+    """
+    if _API_KEY_OK:
+        return False
+    print_check(name, True, "OpenAI API key not configured", skipped=True)
+    return True
+
+
+def exception_summary(e: BaseException) -> str:
+    """
+    Describe an exception as its type and message, without a traceback.
+    
+    format_exception_only skips walking the stack frames; the full
+    traceback is only printed when TEST_VERBOSE=1.
+    """
+    return "".join(traceback.format_exception_only(type(e), e)).strip()
+
+
+def run_buffered(test_func: Callable[[], Any]) -> List[str]:
+    """Run a check in the current thread and return its buffered output."""
+    thread_output.lines = []
+    try:
+        test_func()
+    except Exception as e:
+        print_check(f"{test_func.__name__} (exception)", False, exception_summary(e))
+        if VERBOSE:
+            emit(traceback.format_exc())
+    finally:
+        lines = thread_output.lines
+        thread_output.lines = None
+    return lines
 
 
 def api_request(method: str, endpoint: str, data: Optional[Dict] = None, params: Optional[Dict] = None) -> Optional[Dict]:
@@ -107,51 +279,144 @@ def api_request(method: str, endpoint: str, data: Optional[Dict] = None, params:
         else:
             return None
         
-        if response.content:
-            try:
-                json_data = response.json()
-                return {
-                    "status_code": response.status_code,
-                    "data": json_data,
-                    "success": 200 <= response.status_code < 300,
-                    "headers": dict(response.headers),
-                    "text": response.text
-                }
-            except ValueError:
-                return {
-                    "status_code": response.status_code,
-                    "data": response.text,
-                    "success": 200 <= response.status_code < 300,
-                    "headers": dict(response.headers),
-                    "text": response.text
-                }
+        # Decide how to read the body from its content type rather than
+        # attempting a JSON parse and catching the failure
+        if not response.content:
+            data = None
+        elif response.headers.get("content-type", "").startswith("application/json"):
+            data = response.json()
         else:
-            return {
-                "status_code": response.status_code,
-                "data": None,
-                "success": 200 <= response.status_code < 300,
-                "headers": dict(response.headers),
-                "text": ""
-            }
+            data = response.text
+        
+        return {
+            "status_code": response.status_code,
+            "data": data,
+            "success": 200 <= response.status_code < 300,
+            "headers": dict(response.headers),
+            "text": response.text
+        }
     except requests.exceptions.ConnectionError:
         return {"error": "Connection refused - is the server running?", "success": False}
     except Exception as e:
         return {"error": str(e), "success": False}
 
 
+@lru_cache(maxsize=8)
+def _read_cached(path_str: str, mtime_ns: int, size: int) -> bytes:
+    """Read a file's bytes; cached per (path, mtime, size) version."""
+    return Path(path_str).read_bytes()
+
+
+def read_file_bytes(file_path: Path) -> Optional[bytes]:
+    """
+    Read a file, reusing the previous read while the file is unchanged.
+    
+    Several checks scan the same log files; keying the cache on the file's
+    modification time and size means a log the server has written to since
+    is read again. The single stat() also answers whether the file exists,
+    so callers don't need a separate exists() check.
+    
+    Args:
+        file_path: File to read
+        
+    Returns:
+        File contents, or None if the path isn't an existing regular file
+    """
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return _read_cached(str(file_path), st.st_mtime_ns, st.st_size)
+
+
+def read_tail_lines(file_path: Path, count: int) -> Optional[bytes]:
+    """
+    Read the last count lines of a file.
+    
+    Large logs are memory-mapped and searched backwards for line breaks, so
+    only the tail is copied instead of reading and splitting the whole file.
+    
+    Args:
+        file_path: File to read
+        count: Number of trailing lines to return
+        
+    Returns:
+        The trailing lines, or None if the path isn't an existing regular file
+    """
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    
+    # Mapping costs more than it saves for small files
+    if st.st_size < 64 * 1024:
+        return b''.join(read_file_bytes(file_path).splitlines(keepends=True)[-count:])
+    
+    with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # A trailing newline ends the last line rather than starting a new one
+        pos = len(mm) - 1 if mm[-1:] == b"\n" else len(mm)
+        for _ in range(count):
+            pos = mm.rfind(b"\n", 0, pos)
+            if pos == -1:
+                break
+        return mm[pos + 1:]
+
+
+@lru_cache(maxsize=None)
+def compile_patterns(patterns: Tuple[Tuple[str, str], ...]) -> Tuple[Tuple[str, "re.Pattern[bytes]"], ...]:
+    """
+    Compile named patterns once as case-insensitive bytes regexes.
+    
+    Each pattern stays a separate regex, so matches of different patterns
+    may overlap without one hiding the other.
+    
+    Args:
+        patterns: Tuple of (pattern_name, regex) pairs
+        
+    Returns:
+        Tuple of (pattern_name, compiled regex) pairs
+    """
+    return tuple((name, re.compile(pattern.encode(), re.IGNORECASE)) for name, pattern in patterns)
+
+
+def scan_patterns(content: bytes, patterns: Tuple[Tuple[str, str], ...]) -> Dict[str, List[bytes]]:
+    """
+    Find matches for several named patterns, scanning once per pattern.
+    
+    Args:
+        content: Bytes to search
+        patterns: Tuple of (pattern_name, regex) pairs
+        
+    Returns:
+        Dictionary mapping pattern name to its matched bytes (names without
+        matches are left out)
+    """
+    matches = {}
+    for name, regex in compile_patterns(patterns):
+        found = [match.group() for match in regex.finditer(content)]
+        if found:
+            matches[name] = found
+    return matches
+
+
 def check_file_for_sensitive_data(file_path: Path, patterns: List[tuple]) -> List[str]:
     """Check file for sensitive data patterns."""
     findings = []
-    if not file_path.exists():
-        return findings
     
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-            for pattern_name, pattern in patterns:
-                matches = re.findall(pattern, content, re.IGNORECASE)
-                if matches:
-                    findings.append(f"{pattern_name}: {len(matches)} matches")
+        # Search the raw bytes; logs are ASCII-dominated, so there's no need
+        # to decode the whole file first
+        content = read_file_bytes(file_path)
+        if content is None:
+            return findings
+        found = scan_patterns(content, tuple(patterns))
+        for pattern_name, _ in patterns:
+            if pattern_name in found:
+                findings.append(f"{pattern_name}: {len(found[pattern_name])} matches")
     except Exception:
         pass
     
@@ -166,6 +431,9 @@ def test_profile_isolation():
     """Test profile isolation working."""
     print_header("SECTION 1: PRIVACY ENFORCEMENT - PROFILE ISOLATION")
     
+    if skip_without_api_key("Profile isolation working"):
+        return True
+    
     # Create two users with separate profiles
     user1_data = {
         "email": f"user1_{int(time.time())}@test.com",
@@ -329,6 +597,9 @@ def test_no_data_leakage_between_profiles():
     """Test no data leakage between profiles."""
     print_header("NO DATA LEAKAGE BETWEEN PROFILES")
     
+    if skip_without_api_key("No data leakage between profiles"):
+        return True
+    
     # Create user with two profiles
     user_data = {
         "email": f"profile_test_{int(time.time())}@test.com",
@@ -420,6 +691,9 @@ def test_incognito_mode_truly_private():
     """Test Incognito mode is truly private."""
     print_header("INCOGNITO MODE TRULY PRIVATE")
     
+    if skip_without_api_key("Incognito mode truly private"):
+        return True
+    
     # Create user and profile
     user_data = {
         "email": f"incognito_test_{int(time.time())}@test.com",
@@ -433,11 +707,7 @@ def test_incognito_mode_truly_private():
     
     user_id = user_response["data"]["id"]
     
-    profile_data = {
-        "name": "Test Profile",
-        "description": "Test"
-    }
-    profile_response = api_request("POST", f"/users/{user_id}/profiles", profile_data)
+    profile_response = api_request("POST", f"/users/{user_id}/profiles", TEST_PROFILE_DATA)
     
     if not profile_response or not profile_response.get("success"):
         print_check("Incognito mode truly private", False, "Failed to create profile")
@@ -516,39 +786,18 @@ def test_api_keys_not_exposed():
         response_data = invalid_response.get("data", {})
         
         # Check for API key patterns
-        api_key_patterns = [
-            r'sk-[a-zA-Z0-9]{20,}',
-            r'api[_-]?key["\s:=]+([a-zA-Z0-9\-_]{20,})',
-        ]
-        
-        for pattern in api_key_patterns:
-            if re.search(pattern, response_text, re.IGNORECASE):
-                exposed = True
-                break
-            
-            if isinstance(response_data, dict):
-                data_str = json.dumps(response_data)
-                if re.search(pattern, data_str, re.IGNORECASE):
-                    exposed = True
-                    break
+        api_key_res = [regex for _, regex in compile_patterns(API_KEY_PATTERNS)]
+        if any(regex.search(response_text.encode()) for regex in api_key_res):
+            exposed = True
+        elif isinstance(response_data, dict) and any(
+            regex.search(json.dumps(response_data).encode()) for regex in api_key_res
+        ):
+            exposed = True
     
     # Check log files for API keys
-    log_files = [
-        LOGS_DIR / "app.log",
-        LOGS_DIR / "errors.log"
-    ]
-    
-    api_key_patterns = [
-        ("OpenAI API Key", r'sk-[a-zA-Z0-9]{20,}'),
-        ("API Key Pattern", r'api[_-]?key["\s:=]+([a-zA-Z0-9\-_]{20,})'),
-    ]
-    
     log_exposures = []
-    for log_file in log_files:
-        if log_file.exists():
-            findings = check_file_for_sensitive_data(log_file, api_key_patterns)
-            if findings:
-                log_exposures.extend(findings)
+    for log_file in LOG_FILES:
+        log_exposures.extend(check_file_for_sensitive_data(log_file, API_KEY_PATTERNS))
     
     no_exposure = not exposed and len(log_exposures) == 0
     print_check("API keys not exposed", no_exposure,
@@ -560,39 +809,23 @@ def test_sensitive_data_not_logged():
     """Test sensitive data is not logged."""
     print_header("SENSITIVE DATA NOT LOGGED")
     
-    # Check log files for sensitive data patterns
-    sensitive_patterns = [
-        ("Email addresses", r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
-        ("Phone numbers", r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'),
-        ("SSN", r'\b\d{3}-\d{2}-\d{4}\b'),
-        ("Credit cards", r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b'),
-    ]
-    
-    log_files = [
-        LOGS_DIR / "app.log",
-        LOGS_DIR / "errors.log"
-    ]
-    
     all_findings = []
-    for log_file in log_files:
-        if log_file.exists():
-            # Only check recent entries (last 1000 lines to avoid false positives from test data)
-            try:
-                with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-                    recent_lines = lines[-1000:] if len(lines) > 1000 else lines
-                    content = ''.join(recent_lines)
-                    
-                    for pattern_name, pattern in sensitive_patterns:
-                        matches = re.findall(pattern, content, re.IGNORECASE)
-                        # Filter out test patterns and common false positives
-                        real_matches = [m for m in matches if not any(
-                            test_word in str(m).lower() for test_word in ['test', 'example', 'sample', 'demo']
-                        )]
-                        if real_matches:
-                            all_findings.append(f"{pattern_name}: {len(real_matches)} in {log_file.name}")
-            except Exception:
-                pass
+    # Check log files for sensitive data patterns
+    for log_file in LOG_FILES:
+        # Only check recent entries (last 1000 lines to avoid false positives from test data)
+        try:
+            content = read_tail_lines(log_file, 1000)
+            if content is not None:
+                found = scan_patterns(content, SENSITIVE_PATTERNS)
+                for pattern_name, _ in SENSITIVE_PATTERNS:
+                    # Filter out test patterns and common false positives
+                    real_matches = [m for m in found.get(pattern_name, []) if not any(
+                        test_word in m.lower() for test_word in TEST_DATA_WORDS
+                    )]
+                    if real_matches:
+                        all_findings.append(f"{pattern_name}: {len(real_matches)} in {log_file.name}")
+        except Exception:
+            pass
     
     # It's acceptable to have some test data in logs, but real sensitive data should be redacted
     # We check that the error handler sanitizes data
@@ -606,6 +839,9 @@ def test_pii_detection_working():
     """Test PII detection is working."""
     print_header("PII DETECTION WORKING")
     
+    if skip_without_api_key("PII detection working"):
+        return True
+    
     # Create user and session
     user_data = {
         "email": f"pii_test_{int(time.time())}@test.com",
@@ -619,11 +855,7 @@ def test_pii_detection_working():
     
     user_id = user_response["data"]["id"]
     
-    profile_data = {
-        "name": "Test Profile",
-        "description": "Test"
-    }
-    profile_response = api_request("POST", f"/users/{user_id}/profiles", profile_data)
+    profile_response = api_request("POST", f"/users/{user_id}/profiles", TEST_PROFILE_DATA)
     
     if not profile_response or not profile_response.get("success"):
         print_check("PII detection working", False, "Failed to create profile")
@@ -669,22 +901,48 @@ def test_pii_detection_working():
         return False
 
 
+def test_overlapping_pii_detected():
+    """Test overlapping phone, card and SSN matches are all detected and redacted."""
+    print_header("OVERLAPPING PII DETECTION")
+    
+    from agents.privacy_guardian_agent import PrivacyGuardianAgent
+    
+    agent = PrivacyGuardianAgent()
+    # The phone pattern matches "1 4111111111", which starts inside the
+    # same digits as the card number
+    message = "my card is 1 4111111111111111 and my ssn is 123-45-6789"
+    result = agent.execute({
+        "user_message": message,
+        "privacy_mode": "incognito",
+    })
+    data = result.get("data", {})
+    detected = {v.get("type") for v in data.get("violations", [])}
+    sanitized = data.get("sanitized_content", "")
+    
+    all_detected = {"phone", "credit_card", "ssn"} <= detected
+    print_check("Overlapping phone and card both detected", all_detected,
+               f"Detected types: {sorted(detected)}")
+    
+    blocked = data.get("allowed") is False
+    print_check("Incognito blocks overlapping card number", blocked,
+               f"allowed={data.get('allowed')}")
+    
+    redacted = "4111" not in sanitized and "6789" not in sanitized
+    print_check("Overlapping card and SSN redacted", redacted,
+               f"Sanitized: {sanitized}")
+    
+    return all_detected and blocked and redacted
+
+
 def test_no_sql_injection():
     """Test no SQL injection vulnerabilities."""
     print_header("NO SQL INJECTION VULNERABILITIES")
     
     # Test SQL injection attempts in various endpoints
-    sql_injection_payloads = [
-        "'; DROP TABLE users; --",
-        "' OR '1'='1",
-        "1' UNION SELECT * FROM users--",
-        "admin'--",
-    ]
-    
     vulnerabilities_found = []
     
     # Test in user creation (email/username)
-    for payload in sql_injection_payloads[:2]:  # Test first 2
+    for payload in SQL_INJECTION_PAYLOADS[:2]:  # Test first 2
         user_data = {
             "email": f"{payload}@test.com",
             "username": payload
@@ -693,7 +951,7 @@ def test_no_sql_injection():
         
         # Should either reject (validation error) or sanitize
         if response:
-            if response.get("status_code") in [400, 422]:
+            if response.get("status_code") in VALIDATION_STATUS_CODES:
                 # Good - validation rejected it
                 pass
             elif response.get("success"):
@@ -712,7 +970,7 @@ def test_no_sql_injection():
     if user_response and user_response.get("success"):
         user_id = user_response["data"]["id"]
         
-        for payload in sql_injection_payloads[:2]:
+        for payload in SQL_INJECTION_PAYLOADS[:2]:
             profile_data = {
                 "name": payload,
                 "description": "Test"
@@ -720,7 +978,7 @@ def test_no_sql_injection():
             response = api_request("POST", f"/users/{user_id}/profiles", profile_data)
             
             if response:
-                if response.get("status_code") in [400, 422]:
+                if response.get("status_code") in VALIDATION_STATUS_CODES:
                     # Good - validation rejected it
                     pass
                 elif response.get("success"):
@@ -731,11 +989,7 @@ def test_no_sql_injection():
     # Test in message content
     if user_response and user_response.get("success"):
         user_id = user_response["data"]["id"]
-        profile_data = {
-            "name": "Test Profile",
-            "description": "Test"
-        }
-        profile_response = api_request("POST", f"/users/{user_id}/profiles", profile_data)
+        profile_response = api_request("POST", f"/users/{user_id}/profiles", TEST_PROFILE_DATA)
         
         if profile_response and profile_response.get("success"):
             profile_id = profile_response["data"]["id"]
@@ -748,7 +1002,7 @@ def test_no_sql_injection():
             if session_response and session_response.get("success"):
                 session_id = session_response["data"]["id"]
                 
-                for payload in sql_injection_payloads[:2]:
+                for payload in SQL_INJECTION_PAYLOADS[:2]:
                     message_data = {
                         "message": payload,
                         "session_id": session_id
@@ -757,7 +1011,7 @@ def test_no_sql_injection():
                     
                     # Should process or reject safely
                     if response:
-                        if response.get("status_code") in [400, 422, 500]:
+                        if response.get("status_code") in (400, 422, 500):
                             # Error is acceptable - means it was handled
                             pass
                         elif response.get("success"):
@@ -781,12 +1035,6 @@ def test_no_sensitive_data_in_error_messages():
     print_header("SECTION 3: ERROR HANDLING - NO SENSITIVE DATA IN ERROR MESSAGES")
     
     # Trigger various errors and check responses
-    sensitive_patterns = [
-        ("API Key", r'sk-[a-zA-Z0-9]{20,}'),
-        ("Email", r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
-        ("Database path", r'/[\w/]+\.(db|sqlite)'),
-    ]
-    
     errors_checked = 0
     sensitive_data_found = []
     
@@ -795,17 +1043,16 @@ def test_no_sensitive_data_in_error_messages():
     if response:
         errors_checked += 1
         response_text = json.dumps(response.get("data", {}))
-        for pattern_name, pattern in sensitive_patterns:
+        for pattern_name, pattern in ERROR_RESPONSE_PATTERNS:
             if re.search(pattern, response_text, re.IGNORECASE):
                 sensitive_data_found.append(f"{pattern_name} in 404 error")
     
     # Test validation error
-    invalid_data = {"email": "invalid", "username": ""}
-    response = api_request("POST", "/users", invalid_data)
+    response = api_request("POST", "/users", INVALID_USER_DATA)
     if response:
         errors_checked += 1
         response_text = json.dumps(response.get("data", {}))
-        for pattern_name, pattern in sensitive_patterns:
+        for pattern_name, pattern in ERROR_RESPONSE_PATTERNS:
             if re.search(pattern, response_text, re.IGNORECASE):
                 sensitive_data_found.append(f"{pattern_name} in validation error")
     
@@ -822,34 +1069,20 @@ def test_stack_traces_not_exposed():
     """Test stack traces are not exposed to users."""
     print_header("STACK TRACES NOT EXPOSED")
     
-    # Check error responses for stack trace indicators
-    stack_trace_indicators = [
-        "Traceback",
-        "File \"",
-        "line ",
-        "at 0x",
-        "Exception:",
-        "Error:",
-        "TypeError:",
-        "ValueError:",
-        "AttributeError:",
-    ]
-    
-    # Test various error scenarios
-    test_cases = [
+    # Test various error scenarios and check the responses for stack trace indicators
+    test_cases = (
         ("404", api_request("GET", "/users/99999")),
-        ("Validation", api_request("POST", "/users", {"email": "invalid", "username": ""})),
+        ("Validation", api_request("POST", "/users", INVALID_USER_DATA)),
         ("Invalid endpoint", api_request("GET", "/invalid/endpoint/123")),
-    ]
+    )
     
     stack_traces_found = []
     for test_name, response in test_cases:
         if response:
-            response_text = json.dumps(response.get("data", {}))
-            response_text_lower = response_text.lower()
+            response_text_lower = json.dumps(response.get("data", {})).lower()
             
-            for indicator in stack_trace_indicators:
-                if indicator.lower() in response_text_lower:
+            for indicator in STACK_TRACE_INDICATORS:
+                if indicator in response_text_lower:
                     stack_traces_found.append(f"{indicator} in {test_name} error")
     
     no_stack_traces = len(stack_traces_found) == 0
@@ -863,11 +1096,11 @@ def test_proper_exception_handling():
     print_header("PROPER EXCEPTION HANDLING")
     
     # Test that errors return proper JSON responses with error codes
-    test_cases = [
+    test_cases = (
         ("404 Not Found", api_request("GET", "/users/99999")),
         ("422 Validation Error", api_request("POST", "/users", {"email": "invalid"})),
         ("400 Bad Request", api_request("POST", "/users", {})),
-    ]
+    )
     
     proper_handling = True
     issues = []
@@ -899,50 +1132,80 @@ def test_proper_exception_handling():
     
     print_check("Proper exception handling", proper_handling,
                "All errors return proper JSON responses" if proper_handling else f"Issues: {issues}")
-    return proper_handling
+    
+    # Check the error handler defines the expected exceptions and helpers;
+    # collect every defined name in one pass rather than searching per name
+    source = read_file_bytes(ERROR_HANDLER_FILE)
+    if source is not None:
+        defined = {match.group(1).decode() for match in DEF_RE.finditer(source)}
+        missing = [name for name in REQUIRED_ERROR_HANDLERS if name not in defined]
+    else:
+        missing = list(REQUIRED_ERROR_HANDLERS)
+    print_check("Error handler defines exceptions and helpers", not missing,
+               f"{len(REQUIRED_ERROR_HANDLERS)} definitions found" if not missing else f"Missing: {missing}")
+    
+    return proper_handling and not missing
 
 
 # ============================================================================
 # MAIN EXECUTION
 # ============================================================================
 
+# Checks that scan the log files; see main
+LOG_SCANNING_CHECKS = frozenset((test_api_keys_not_exposed, test_sensitive_data_not_logged))
+
+
 def main():
     """Run all security verification tests."""
-    print(f"\n{Colors.BOLD}{Colors.CYAN}")
-    print("=" * 70)
-    print("PHASE 9 STEP 9.3: SECURITY VERIFICATION".center(70))
-    print("=" * 70)
-    print(f"{Colors.RESET}\n")
-    
-    print(f"{Colors.BOLD}This script verifies all security measures from Phase 9 Step 9.3{Colors.RESET}")
-    print(f"{Colors.YELLOW}Note: Some tests require the backend server to be running.{Colors.RESET}\n")
+    print_banner("PHASE 9 STEP 9.3: SECURITY VERIFICATION",
+                 f"{Colors.BOLD}This script verifies all security measures from Phase 9 Step 9.3{Colors.RESET}")
     
     # Check if server is running
     try:
         response = requests.get(f"{BASE_URL}/health", timeout=2)
         if response.status_code != 200:
-            print(f"{Colors.RED}Backend server is not running or not healthy.{Colors.RESET}")
-            print(f"{Colors.YELLOW}Some tests will be skipped.{Colors.RESET}\n")
+            sys.stdout.write(SERVER_UNHEALTHY_NOTICE)
     except:
-        print(f"{Colors.RED}Backend server is not running.{Colors.RESET}")
-        print(f"{Colors.YELLOW}Some tests will be skipped.{Colors.RESET}\n")
-    
-    # Section 1: Privacy Enforcement
-    test_profile_isolation()
-    test_no_data_leakage_between_users()
-    test_no_data_leakage_between_profiles()
-    test_incognito_mode_truly_private()
-    
-    # Section 2: Data Protection
-    test_api_keys_not_exposed()
-    test_sensitive_data_not_logged()
-    test_pii_detection_working()
-    test_no_sql_injection()
-    
-    # Section 3: Error Handling
-    test_no_sensitive_data_in_error_messages()
-    test_stack_traces_not_exposed()
-    test_proper_exception_handling()
+        sys.stdout.write(SERVER_DOWN_NOTICE)
+    
+    tests = (
+        # Section 1: Privacy Enforcement
+        test_profile_isolation,
+        test_no_data_leakage_between_users,
+        test_no_data_leakage_between_profiles,
+        test_incognito_mode_truly_private,
+        # Section 2: Data Protection
+        test_api_keys_not_exposed,
+        test_sensitive_data_not_logged,
+        test_pii_detection_working,
+        test_overlapping_pii_detected,
+        test_no_sql_injection,
+        # Section 3: Error Handling
+        test_no_sensitive_data_in_error_messages,
+        test_stack_traces_not_exposed,
+        test_proper_exception_handling,
+    )
+    
+    # The API-driven checks each create their own users and profiles and
+    # mostly wait on the API, so run them concurrently. The log-scanning
+    # checks run one at a time once that batch has finished, so they don't
+    # read the logs while other checks are still sending PII and writing
+    # to them. Each check's output is written in order, in a single call
+    outputs = {}
+    api_checks = [test for test in tests if test not in LOG_SCANNING_CHECKS]
+    with ThreadPoolExecutor(max_workers=len(api_checks)) as executor:
+        futures = {test: executor.submit(run_buffered, test) for test in api_checks}
+        for test, future in futures.items():
+            outputs[test] = future.result()
+    for test in tests:
+        if test in LOG_SCANNING_CHECKS:
+            outputs[test] = run_buffered(test)
+    
+    for test in tests:
+        lines = outputs[test]
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
     
     # Print summary
     print_header("SECURITY VERIFICATION SUMMARY")
@@ -950,31 +1213,28 @@ def main():
     total = test_results["passed"] + test_results["failed"] + test_results["skipped"]
     pass_rate = (test_results["passed"] / total * 100) if total > 0 else 0
     
-    print(f"  {Colors.BOLD}Total Checks:{Colors.RESET} {total}")
-    print(f"  {Colors.GREEN}Passed:{Colors.RESET} {test_results['passed']}")
-    print(f"  {Colors.RED}Failed:{Colors.RESET} {test_results['failed']}")
-    print(f"  {Colors.YELLOW}Skipped:{Colors.RESET} {test_results['skipped']}")
-    print(f"  {Colors.BOLD}Pass Rate:{Colors.RESET} {pass_rate:.1f}%")
-    
-    if test_results["errors"]:
-        print(f"\n{Colors.RED}Security Issues Found:{Colors.RESET}")
-        for error in test_results["errors"][:10]:  # Show first 10 errors
-            print(f"  - {error}")
-        if len(test_results["errors"]) > 10:
-            print(f"  ... and {len(test_results['errors']) - 10} more")
-    
-    print()
-    
-    # Final verdict
-    if test_results["failed"] == 0:
-        print(f"{Colors.GREEN}{Colors.BOLD}✓ CHECKPOINT 9.3: ALL SECURITY REQUIREMENTS MET{Colors.RESET}")
-        print(f"{Colors.GREEN}Privacy enforced correctly, data protected, no security vulnerabilities found.{Colors.RESET}")
-        print(f"{Colors.GREEN}Application is ready for use.{Colors.RESET}\n")
-        return 0
-    else:
-        print(f"{Colors.YELLOW}{Colors.BOLD}⚠ CHECKPOINT 9.3: SOME SECURITY REQUIREMENTS NOT MET{Colors.RESET}")
-        print(f"{Colors.YELLOW}Please review the failed security checks above.{Colors.RESET}\n")
-        return 1
+    summary = [
+        f"  {Colors.BOLD}Total Checks:{Colors.RESET} {total}",
+        f"  {Colors.GREEN}Passed:{Colors.RESET} {test_results['passed']}",
+        f"  {Colors.RED}Failed:{Colors.RESET} {test_results['failed']}",
+        f"  {Colors.YELLOW}Skipped:{Colors.RESET} {test_results['skipped']}",
+        f"  {Colors.BOLD}Pass Rate:{Colors.RESET} {pass_rate:.1f}%",
+    ]
+    
+    # The summary reads the counters kept by print_check; nothing is rescanned
+    if test_results["failed"]:
+        summary.append(f"\n{Colors.RED}Security Issues Found:{Colors.RESET}")
+        summary.extend(f"  - {error}" for error in test_results["errors"])
+        unlisted = test_results["failed"] - len(test_results["errors"])
+        if unlisted:
+            summary.append(f"  ... and {unlisted} more")
+    
+    # Write the whole summary and the final verdict at once, separated by a
+    # blank line
+    passed = test_results["failed"] == 0
+    sys.stdout.write("\n".join(summary) + "\n\n" + (VERDICT_PASSED if passed else VERDICT_FAILED))
+    sys.stdout.flush()
+    return 0 if passed else 1
 
 
 if __name__ == "__main__":
@@ -985,9 +1245,9 @@ if __name__ == "__main__":
         print(f"\n\n{Colors.YELLOW}Security verification interrupted by user.{Colors.RESET}")
         sys.exit(1)
     except Exception as e:
-        print(f"\n\n{Colors.RED}Unexpected error: {e}{Colors.RESET}")
-        import traceback
-        traceback.print_exc()
+        print(f"\n\n{Colors.RED}Unexpected error: {exception_summary(e)}{Colors.RESET}")
+        if VERBOSE:
+            traceback.print_exc()
         sys.exit(1)
 
 